@@ -3,11 +3,13 @@ import api.projects
 import api.experiences
 import api.templates
 import api.generate
+import api.system
 
 __all__ = [
     "profile",
     "projects",
     "experiences",
     "templates",
-    "generate"
+    "generate",
+    "system"
 ]
\ No newline at end of file
@@ -0,0 +1,133 @@
+import json
+import time
+from typing import Any, Iterable, Iterator, Sequence, Type
+import numpy as np
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+from config import settings
+from repositories import EmbeddingRepo
+from services.model_registry import model_key
+from schemas import BulkImportError, BulkImportResponse, BulkImportTimings
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+async def parse_bulk_body(request: Request, schema: Type[BaseModel]) -> tuple[list[BaseModel], list[BulkImportError], int]:
+    """
+    Read a JSON array or an NDJSON stream (one object per line) and validate each
+    record against `schema`. Returns the valid records, per-line errors and the
+    number of records received.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    records: list[tuple[int, Any]] = []
+
+    if content_type in NDJSON_TYPES:
+        # NDJSON é lido em streaming, linha a linha
+        buffer = b""
+        line_no = 0
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line_no += 1
+                if line.strip():
+                    records.append((line_no, line))
+        if buffer.strip():
+            records.append((line_no + 1, buffer))
+    else:
+        try:
+            payload = json.loads(await request.body())
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid JSON: {e}")
+        if not isinstance(payload, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array")
+        records = list(enumerate(payload, start=1))
+
+    if len(records) > settings.bulk_import_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.bulk_import_max_items} records per request"
+        )
+
+    valid, errors = [], []
+    for line, record in records:
+        try:
+            if isinstance(record, bytes):
+                valid.append(schema.model_validate_json(record))
+            else:
+                valid.append(schema.model_validate(record))
+        except ValidationError as e:
+            message = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc']) or 'record'}: {err['msg']}"
+                for err in e.errors(include_url=False)
+            )
+            errors.append(BulkImportError(line=line, error=message))
+
+    return valid, errors, len(records)
+
+
+def run_bulk_import(
+    repo: Any,
+    records: list[BaseModel],
+    errors: list[BulkImportError],
+    received: int,
+    parse_seconds: float,
+) -> BulkImportResponse:
+    """
+    Insert all valid records through `repo.create_many` (one transaction). They
+    are embedded later, when the vector index applies the queued changes on the
+    next search, so the response only reports what was committed.
+    """
+    start = time.perf_counter()
+    created = repo.create_many([r.model_dump() for r in records])
+    insert_seconds = time.perf_counter() - start
+
+    return BulkImportResponse(
+        received=received,
+        inserted=len(created),
+        failed=len(errors),
+        ids=[item.id for item in created],
+        errors=errors,
+        timings=BulkImportTimings(
+            parse_seconds=round(parse_seconds, 4),
+            insert_seconds=round(insert_seconds, 4),
+            total_seconds=round(parse_seconds + insert_seconds, 4),
+        ),
+    )
+
+
+def export_ndjson(
+    batches: Iterable[Sequence[Any]],
+    schema: Type[BaseModel],
+    embedding_kind: str | None = None,
+) -> Iterator[str]:
+    """
+    Serialize ORM rows as NDJSON, one chunk of lines per batch.
+
+    With `embedding_kind`, each record gets an `embedding` field with its cached
+    vector for the current model (a list of vectors when indexed in chunks), or
+    null if it hasn't been embedded yet.
+    """
+    embedding_repo = EmbeddingRepo() if embedding_kind else None
+
+    for batch in batches:
+        vectors = {}
+        if embedding_repo is not None:
+            vectors = embedding_repo.get_many(
+                embedding_kind, [item.id for item in batch], model_key(settings.embedding_model)
+            )
+
+        lines = []
+        for item in batch:
+            record = schema.model_validate(item).model_dump(mode="json")
+            if embedding_repo is not None:
+                row = vectors.get(item.id)
+                if row is None:
+                    record["embedding"] = None
+                else:
+                    matrix = EmbeddingRepo.to_array(row).astype(np.float32)
+                    record["embedding"] = matrix[0].tolist() if len(matrix) == 1 else matrix.tolist()
+            lines.append(json.dumps(record, ensure_ascii=False))
+
+        if lines:
+            yield "\n".join(lines) + "\n"
@@ -1,18 +1,27 @@
+import io
+import json
 import logging
-from fastapi import APIRouter, HTTPException
+import zipfile
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from fastapi.responses import FileResponse
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, validator
 from pathlib import Path
-import datetime
+import time
 import uuid
 from config import settings
-from repositories import ProjectRepo
+from models import GeneratedCV
+from repositories import GeneratedCVRepo, ProjectRepo
 from services import (
     ProfileData,
     ProfileService,
     ProjectMatcherService,
+    ExperienceMatcherService,
+    JobStatus,
     LaTeXService,
-    PDFGeneratorService
+    PDFGeneratorService,
+    QueueFullError,
+    compile_executor,
+    generation_queue
 )
 
 logger = logging.getLogger(__name__)
@@ -23,7 +32,9 @@ class GenerateRequest(BaseModel):
     project_ids: list[int] | None = None
     job_description: str | None = None
     top_n: int = 5
+    top_n_experiences: int = 3
     template: str = "basic"
+    background: bool = False  # devolve logo um job id em vez de esperar pelo PDF
 
     @validator('project_ids', 'job_description')
     def check_at_least_one(cls, v, values):
@@ -39,71 +50,81 @@ class GenerateResponse(BaseModel):
     pdf_path: str
     tex_path: str
     selected_projects: list[dict]
+    selected_experiences: list[dict] = []
+    generation_time_seconds: float | None = None
+    compile_passes: int | None = None
     created_at: str
 
 
-GENERATED_CVS = {}
+class GenerateBatchRequest(BaseModel):
+    job_descriptions: list[str] = Field(..., min_length=1)
+    top_n: int = 5
+    top_n_experiences: int = 3
+    template: str = "basic"
+    zip: bool = False  # devolve um .zip com os PDFs em vez de JSON
 
-@router.post("", response_model=GenerateResponse)
-def generate_cv(data: GenerateRequest):
-    try:
-        # === ETAPA 1: Obter projetos ===
-        if data.project_ids:
-            # User selecionou manualmente
-            selected_projects = _get_projects_by_ids(data.project_ids)
-            scores = [1.0] * len(selected_projects)  # score=1 (manual selection)
-        
-        elif data.job_description:
-            # Auto-matching
-            matcher = ProjectMatcherService()
-            results = matcher.match_projects(data.job_description, top_n=data.top_n)
-            selected_projects = [r["project"] for r in results]
-            scores = [r["score"] for r in results]
-        
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail="Must provide either project_ids or job_description"
-            )
-        
-        if not selected_projects:
+    @validator('job_descriptions')
+    def check_batch_size(cls, v):
+        if len(v) > settings.generation_batch_max_items:
+            raise ValueError(f'At most {settings.generation_batch_max_items} job descriptions per batch')
+        return v
+
+
+class GenerateBatchItem(BaseModel):
+    index: int
+    id: str | None = None
+    status: str
+    error: str | None = None
+    cv: GenerateResponse | None = None
+
+
+class GenerateBatchResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    generation_time_seconds: float
+    items: list[GenerateBatchItem]
+
+
+class GenerateJobResponse(BaseModel):
+    id: str
+    status: str
+
+
+class GenerateHistoryResponse(BaseModel):
+    total: int
+    offset: int
+    limit: int
+    items: list[GenerateResponse]
+
+
+@router.post("", response_model=GenerateResponse | GenerateJobResponse)
+def generate_cv(data: GenerateRequest, response: Response):
+    cv_id = str(uuid.uuid4())
+
+    if data.background:
+        # Job mode: o pipeline corre no worker pool, o cliente faz polling em GET /{id}.
+        # O estado vive na base de dados para que qualquer worker o possa responder.
+        repo = GeneratedCVRepo()
+        repo.create_pending(cv_id, data.job_description, data.template, JobStatus.QUEUED.value)
+        try:
+            job = generation_queue.submit(_run_generation_job, data, cv_id, job_id=cv_id)
+        except QueueFullError as e:
+            repo.delete_pending(cv_id)
             raise HTTPException(
-                status_code=400,
-                detail="No projects selected or matched"
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "5"}
             )
-        
-        # === ETAPA 2: Gerar PDF ===
-        pdf_path, tex_path = _generate_pdf_from_projects(
-            projects=selected_projects,
-            template=data.template
-        )
-        
-        # === ETAPA 3: Salvar metadata ===
-        cv_id = str(uuid.uuid4())
-        meta = {
-            "id": cv_id,
-            "pdf_path": str(pdf_path),
-            "tex_path": str(tex_path),
-            "selected_projects": [
-                {
-                    "id": proj.get("id"),
-                    "title": proj.get("title"),
-                    "score": float(score)
-                }
-                for proj, score in zip(selected_projects, scores)
-            ],
-            "created_at": datetime.datetime.now().isoformat(),
-            "success": True,
-        }
-        
-        # Memory management (limita a 50 CVs)
-        if len(GENERATED_CVS) >= 50:
-            oldest_id = next(iter(GENERATED_CVS))
-            GENERATED_CVS.pop(oldest_id)
-        
-        GENERATED_CVS[cv_id] = meta
-        return meta
-    
+        response.status_code = status.HTTP_202_ACCEPTED
+        return GenerateJobResponse(id=job.id, status=job.status.value)
+
+    try:
+        return _run_generation(data, cv_id)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     except Exception as e:
         logger.exception("CV generation failed")
         raise HTTPException(
@@ -112,21 +133,86 @@ def generate_cv(data: GenerateRequest):
         )
 
 
+@router.post("/batch", response_model=GenerateBatchResponse)
+def generate_cv_batch(data: GenerateBatchRequest):
+    """
+    Generate one CV per job description. Descriptions are embedded in one batch,
+    matched with one index search and compiled in parallel worker processes.
+    With `zip`, the PDFs (plus a manifest.json) come back as a zip archive.
+    """
+    start = time.perf_counter()
+    try:
+        items = _run_batch_generation(data, start)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception("Batch CV generation failed")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch CV generation failed: {str(e)}"
+        )
+
+    succeeded = sum(1 for item in items if item.status == "done")
+    result = GenerateBatchResponse(
+        total=len(items),
+        succeeded=succeeded,
+        failed=len(items) - succeeded,
+        generation_time_seconds=time.perf_counter() - start,
+        items=items,
+    )
+
+    if not data.zip:
+        return result
+
+    buffer = io.BytesIO()
+    # PDFs já vêm comprimidos: ZIP_STORED evita gastar CPU à toa
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        archive.writestr("manifest.json", result.model_dump_json(indent=2))
+        for item in items:
+            if item.cv is not None:
+                archive.write(item.cv.pdf_path, arcname=f"cv_{item.index:03d}_{item.id}.pdf")
+
+    return Response(
+        content=buffer.getvalue(),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="cvs.zip"'},
+    )
+
+
+@router.get("", response_model=GenerateHistoryResponse)
+def list_generated_cvs(
+    limit: int = Query(10, ge=1, le=100, description="Number of CVs to return"),
+    offset: int = Query(0, ge=0, description="Offset for pagination"),
+) -> GenerateHistoryResponse:
+    cvs, total = GeneratedCVRepo().list(limit=limit, offset=offset)
+
+    return GenerateHistoryResponse(
+        total=total,
+        offset=offset,
+        limit=limit,
+        items=[_cv_meta(cv) for cv in cvs],
+    )
+
+
 @router.get("/{id}")
 def get_cv_metadata(id: str):
-    cv = GENERATED_CVS.get(id)
+    cv = GeneratedCVRepo().get_by_uid(id)
     if not cv:
         raise HTTPException(status_code=404, detail="CV not found")
-    return cv
+    if _is_pending(cv):
+        return _job_meta(cv)
+    return _cv_meta(cv)
 
 
 @router.get("/file/{id}")
 def download_cv_file(id: str):
-    cv = GENERATED_CVS.get(id)
+    cv = GeneratedCVRepo().get_by_uid(id)
     if not cv:
         raise HTTPException(status_code=404, detail="CV not found")
+    if _is_pending(cv):
+        raise HTTPException(status_code=409, detail=f"CV is not ready (status: {cv.status})")
 
-    pdf_path = Path(cv["pdf_path"])
+    pdf_path = Path(cv.file_path)
     if not pdf_path.exists():
         raise HTTPException(status_code=404, detail="PDF file not found on disk")
 
@@ -139,32 +225,234 @@ def download_cv_file(id: str):
 
 # === FUNÇÕES AUXILIARES (adiciona no final) ===
 
+def _run_generation(data: GenerateRequest, cv_id: str) -> dict:
+    """
+    Pipeline completo: seleção de projetos → LaTeX → PDF → metadata.
+
+    Raises:
+        ValueError: se não houver projetos selecionados ou encontrados
+    """
+    start = time.perf_counter()
+
+    # Embedding da vaga calculado uma vez e reutilizado para projetos e experiências
+    query_vec = None
+    if data.job_description:
+        matcher = ProjectMatcherService()
+        query_vec = matcher.embedding_service.encode(data.job_description)
+
+    # === ETAPA 1: Obter projetos ===
+    if data.project_ids:
+        # User selecionou manualmente
+        selected_projects = _get_projects_by_ids(data.project_ids)
+        scores = [1.0] * len(selected_projects)  # score=1 (manual selection)
+
+    elif data.job_description:
+        # Auto-matching
+        results = matcher.match_projects(top_n=data.top_n, query_vec=query_vec)
+        selected_projects = [r["project"] for r in results]
+        scores = [r["score"] for r in results]
+
+    else:
+        raise ValueError("Must provide either project_ids or job_description")
+
+    if not selected_projects:
+        raise ValueError("No projects selected or matched")
+
+    # === ETAPA 1b: Experiências (só com job description) ===
+    experience_results = []
+    if query_vec is not None and data.top_n_experiences > 0:
+        experience_results = ExperienceMatcherService().match_experiences(
+            top_n=data.top_n_experiences, query_vec=query_vec
+        )
+    selected_experiences = [r["experience"] for r in experience_results]
+
+    # === ETAPA 2: Gerar PDF ===
+    pdf_path, tex_path, passes = _generate_pdf_from_projects(
+        projects=selected_projects,
+        template=data.template,
+        experiences=selected_experiences
+    )
+
+    # === ETAPA 3: Salvar metadata ===
+    cv = _save_cv(
+        cv_id, data.job_description, data.template, selected_projects, scores,
+        experience_results, pdf_path, tex_path, time.perf_counter() - start, passes
+    )
+
+    return _cv_meta(cv)
+
+
+def _run_generation_job(data: GenerateRequest, cv_id: str) -> dict:
+    """`_run_generation` num worker do job queue, com o estado refletido na linha pendente."""
+    repo = GeneratedCVRepo()
+    repo.set_status([cv_id], JobStatus.RUNNING.value)
+    try:
+        return _run_generation(data, cv_id)
+    except Exception as e:
+        repo.set_status([cv_id], JobStatus.FAILED.value, str(e))
+        raise
+
+
+def _run_batch_generation(data: GenerateBatchRequest, start: float) -> list[GenerateBatchItem]:
+    """
+    Pipeline em lote: um encode_batch, uma pesquisa matricial por índice, um
+    profile carregado e compilação dos .tex em paralelo no compile executor.
+    """
+    profile = ProfileService(settings.profile_path).load_profile()
+    if not profile:
+        raise ValueError("Profile not found")
+
+    matcher = ProjectMatcherService()
+    query_vecs = matcher.embedding_service.encode_batch(data.job_descriptions)
+    project_results = matcher.match_projects_many(query_vecs, top_n=data.top_n)
+
+    experience_results = [[] for _ in data.job_descriptions]
+    if data.top_n_experiences > 0:
+        experience_results = ExperienceMatcherService().match_experiences_many(
+            query_vecs, top_n=data.top_n_experiences
+        )
+
+    latex_service = LaTeXService(settings.templates_dir, settings.generated_dir)
+    items: list[GenerateBatchItem] = []
+    pending: dict[int, tuple[str, Path]] = {}
+
+    for i, results in enumerate(project_results):
+        if not results:
+            items.append(GenerateBatchItem(index=i, status="failed", error="No projects matched"))
+            continue
+        context = _prepare_latex_context(
+            profile,
+            [r["project"] for r in results],
+            [r["experience"] for r in experience_results[i]]
+        )
+        cv_id = str(uuid.uuid4())
+        pending[i] = (cv_id, latex_service.save_rendered(data.template, context))
+        items.append(GenerateBatchItem(index=i, id=cv_id, status="queued"))
+
+    # O compile executor limita os processos TeX em paralelo (settings.compile_workers)
+    pdf_service = PDFGeneratorService(settings.generated_dir)
+    futures = {
+        i: compile_executor.submit(pdf_service.build, tex_path, template=data.template)
+        for i, (_, tex_path) in pending.items()
+    }
+    for i, future in futures.items():
+        cv_id, tex_path = pending[i]
+        try:
+            build = future.result()
+        except Exception as e:
+            logger.exception("Batch item %d failed to compile", i)
+            items[i] = GenerateBatchItem(index=i, id=cv_id, status="failed", error=str(e))
+            continue
+
+        results = project_results[i]
+        cv = _save_cv(
+            cv_id, data.job_descriptions[i], data.template,
+            [r["project"] for r in results], [r["score"] for r in results],
+            experience_results[i], build.pdf_path, tex_path, time.perf_counter() - start, build.passes
+        )
+        items[i] = GenerateBatchItem(
+            index=i, id=cv_id, status="done", cv=GenerateResponse(**_cv_meta(cv))
+        )
+
+    return items
+
+
+def _save_cv(
+    cv_id: str,
+    job_description: str | None,
+    template: str,
+    projects: list[dict],
+    scores: list[float],
+    experience_results: list[dict],
+    pdf_path: Path,
+    tex_path: Path,
+    elapsed: float,
+    passes: int | None = None,
+) -> GeneratedCV:
+    """Persiste a metadata de um CV gerado."""
+    cv = GeneratedCV(
+        uid=cv_id,
+        job_description=job_description or "",
+        selected_projects=[
+            {
+                "id": proj.get("id"),
+                "title": proj.get("title"),
+                "score": float(score)
+            }
+            for proj, score in zip(projects, scores)
+        ],
+        selected_experiences=[
+            {
+                "id": r["experience"].get("id"),
+                "position": r["experience"].get("position"),
+                "company": r["experience"].get("company"),
+                "score": float(r["score"])
+            }
+            for r in experience_results
+        ],
+        file_path=str(pdf_path),
+        tex_path=str(tex_path),
+        generation_time_seconds=elapsed,
+        compile_passes=passes,
+    )
+    return GeneratedCVRepo().create(cv, template)
+
+
+def _cv_meta(cv: GeneratedCV) -> dict:
+    return {
+        "id": cv.uid,
+        "pdf_path": cv.file_path,
+        "tex_path": cv.tex_path,
+        "selected_projects": cv.selected_projects or [],
+        "selected_experiences": cv.selected_experiences or [],
+        "generation_time_seconds": cv.generation_time_seconds,
+        "compile_passes": cv.compile_passes,
+        "created_at": cv.created_at.isoformat(),
+        "success": True,
+    }
+
+
+def _is_pending(cv: GeneratedCV) -> bool:
+    return cv.status is not None and cv.status != JobStatus.DONE.value
+
+
+def _job_meta(cv: GeneratedCV) -> dict:
+    """Estado de um job em segundo plano que ainda não terminou (ou falhou)."""
+    return {
+        "id": cv.uid,
+        "status": cv.status,
+        "created_at": cv.created_at.isoformat(),
+        "error": cv.error,
+    }
+
+
 def _get_projects_by_ids(project_ids: list[int]) -> list[dict]:
-    """Busca projetos por IDs no DB"""
+    """Busca projetos por IDs no DB (uma só query, mantém a ordem pedida)"""
     repo = ProjectRepo()
-    projects = []
-    
-    for pid in project_ids:
-        project = repo.get_by_id(pid)
-        if project:
-            projects.append({
-                "id": project.id,
-                "title": project.title,
-                "description": project.description,
-                "technologies": project.technologies,
-                "achievements": project.achievements,
-                # ... outros campos
-            })
-    
-    return projects
+
+    return [
+        {
+            "id": project.id,
+            "title": project.title,
+            "description": project.description,
+            "technologies": project.technologies,
+            "achievements": project.achievements,
+            # ... outros campos
+        }
+        for project in repo.get_many(project_ids)
+    ]
 
 
-def _generate_pdf_from_projects(projects: list[dict], template: str) -> tuple[Path, Path]:
+def _generate_pdf_from_projects(
+    projects: list[dict],
+    template: str,
+    experiences: list[dict] | None = None
+) -> tuple[Path, Path, int]:
     """
-    Gera PDF a partir de lista de projetos.
+    Gera PDF a partir de lista de projetos (e experiências, se houver).
     
     Returns:
-        (pdf_path, tex_path)
+        (pdf_path, tex_path, compile_passes)
     """
     # 1. Carrega profile
     profile_service = ProfileService(settings.profile_path)
@@ -173,7 +461,7 @@ def _generate_pdf_from_projects(projects: list[dict], template: str) -> tuple[Pa
         raise ValueError("Profile not found")
     
     # 2. Prepara context para LaTeX
-    context = _prepare_latex_context(profile, projects)
+    context = _prepare_latex_context(profile, projects, experiences)
     
     # 3. Render template → .tex
     latex_service = LaTeXService(settings.templates_dir, settings.generated_dir)
@@ -181,14 +469,18 @@ def _generate_pdf_from_projects(projects: list[dict], template: str) -> tuple[Pa
     
     # 4. Compila .tex → .pdf
     pdf_service = PDFGeneratorService(settings.generated_dir)
-    pdf_path = pdf_service.generate(tex_path)
+    build = pdf_service.build(tex_path, template=template)
     
-    return pdf_path, tex_path
+    return build.pdf_path, tex_path, build.passes
 
 
-def _prepare_latex_context(profile: ProfileData, projects: list[dict]) -> dict:
+def _prepare_latex_context(
+    profile: ProfileData,
+    projects: list[dict],
+    experiences: list[dict] | None = None
+) -> dict:
     """
-    Converte profile + projects em dict pronto para template LaTeX.
+    Converte profile + projects (+ experiences) em dict pronto para template LaTeX.
     
     IMPORTANTE: Aqui é onde fixes do LaTeX acontecem.
     """
@@ -223,6 +515,7 @@ def _prepare_latex_context(profile: ProfileData, projects: list[dict]) -> dict:
     
     projects_latex = _format_projects_latex(projects)
     context["projects"] = projects_latex
+    context["experiences"] = _format_experiences_latex(experiences or [])
     
     return context
 
@@ -248,4 +541,38 @@ def _format_projects_latex(projects: list[dict]) -> str:
             f"\\textit{{Technologies:}} {techs}\n"
         )
     
-    return "\n".join(latex_parts)
\ No newline at end of file
+    return "\n".join(latex_parts)
+
+
+def _format_experiences_latex(experiences: list[dict]) -> str:
+    """
+    Converte lista de experiências em LaTeX string (inclui o título da secção).
+    Retorna string vazia se não houver experiências.
+    """
+    from services.latex_service import escape_latex
+
+    if not experiences:
+        return ""
+
+    latex_parts = ["\\section*{Experience}\n"]
+
+    for xp in experiences:
+        position = escape_latex(xp.get("position", ""))
+        company = escape_latex(xp.get("company", ""))
+        start = xp.get("start_date")
+        end = xp.get("end_date")
+        period = f"{start:%b %Y} -- {end:%b %Y}" if end else f"{start:%b %Y} -- Present"
+        desc = escape_latex(xp.get("description") or "")
+        achievements = "".join(
+            f"  \\item {escape_latex(a)}\n" for a in xp.get("achievements") or []
+        )
+        techs = escape_latex(", ".join(xp.get("technologies") or []))
+
+        part = f"\\subsection*{{{position} -- {company}}}\n\\textit{{{period}}}\n\n{desc}\n"
+        if achievements:
+            part += f"\\begin{{itemize}}\n{achievements}\\end{{itemize}}\n"
+        if techs:
+            part += f"\n\\textit{{Technologies:}} {techs}\n"
+        latex_parts.append(part)
+
+    return "\n".join(latex_parts)
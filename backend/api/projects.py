@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Query, HTTPException, status
+import time
+from fastapi import APIRouter, Query, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from config import settings
 from services import ProjectMatcherService
 from models import Project
 from repositories import ProjectRepo
+from repositories.pagination import decode_cursor
+from api.bulk_utils import export_ndjson, parse_bulk_body, run_bulk_import
 from schemas import (
+    BulkImportResponse,
     ProjectCreate,
     ProjectUpdate,
     ProjectResponse,
@@ -17,19 +24,70 @@ def get_projects(
     limit: int = Query(10, ge=1, le=100, description="Number of projects to return"),
     offset: int = Query(0, ge=0, description="Offset for pagination"),
     search: str | None = Query(None, description="Search term for title/description"),
+    after: str | None = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Set to false to skip counting all projects"),
 ) -> ProjectListResponse:
     repo = ProjectRepo()
-
-    projects, total = repo.list(limit=limit, offset=offset, search=search)
+    next_cursor = None
+
+    if search:
+        if after:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination is not supported together with search"
+            )
+        projects, total = repo.list(limit=limit, offset=offset, search=search)
+    else:
+        try:
+            cursor = decode_cursor(after) if after else None
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        projects, total, next_cursor = repo.list_page(
+            limit=limit, after=cursor, offset=offset, include_total=include_total
+        )
 
     return ProjectListResponse(
         total=total,
         offset=offset,
         limit=limit,
+        next_cursor=next_cursor,
         projects=[ProjectResponse.model_validate(p) for p in projects],
     )
 
 
+@router.get("/export")
+def export_projects(
+    include_embeddings: bool = Query(False, description="Include the cached embedding vectors"),
+) -> StreamingResponse:
+    """Stream every project as NDJSON, in id order."""
+    batches = ProjectRepo().iter_batches(settings.export_batch_size)
+    # Mesmo "kind" usado pelo índice vetorial na cache de embeddings
+    embedding_kind = (
+        ("project:chunks" if settings.embedding_chunking else "project") if include_embeddings else None
+    )
+
+    return StreamingResponse(
+        export_ndjson(batches, ProjectResponse, embedding_kind),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="projects.ndjson"'},
+    )
+
+
+@router.post("/bulk", response_model=BulkImportResponse, status_code=status.HTTP_200_OK)
+async def bulk_import_projects(request: Request) -> BulkImportResponse:
+    """
+    Import many projects at once from a JSON array or NDJSON (`application/x-ndjson`).
+    Invalid records are reported per line; the valid ones are inserted together.
+    """
+    start = time.perf_counter()
+    records, errors, received = await parse_bulk_body(request, ProjectCreate)
+    parse_seconds = time.perf_counter() - start
+
+    return await run_in_threadpool(
+        run_bulk_import, ProjectRepo(), records, errors, received, parse_seconds
+    )
+
+
 @router.get("/{id}", response_model=ProjectResponse)
 def get_project(
     id: int,
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from services import model_registry, query_cache, generation_queue, pdf_cache, compile_executor
+from services.micro_batcher import batcher_stats
+
+router = APIRouter()
+
+@router.get("/stats")
+def get_stats():
+    return {
+        "models": model_registry.stats(),
+        "query_cache": query_cache.stats(),
+        "micro_batching": batcher_stats(),
+        "generation_queue": generation_queue.stats(),
+        "pdf_cache": pdf_cache.stats(),
+        "compile_executor": compile_executor.stats(),
+    }
@@ -0,0 +1,85 @@
+"""
+Recall vs latency of the approximate vector indexes against exact (Flat) search.
+
+Builds every index over the same synthetic, clustered, normalized vectors
+(embeddings of similar CV items bunch together the same way), uses Flat
+search as ground truth and reports, per configuration, build time (including
+training), mean query latency and recall@k. Sweeps HNSW efSearch and IVF
+nprobe, the knobs behind INDEX_EF_SEARCH and INDEX_NPROBE.
+
+Run from `backend/`:
+    python -m benchmarks.bench_ann_index [--n 100000] [--dim 384] [--queries 200] [--k 10]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from services.vector_index import new_faiss_index, normalize, tune_index
+
+
+def make_vectors(n: int, dim: int, n_queries: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(16, n // 500), dim)).astype(np.float32)
+
+    def sample(count: int) -> np.ndarray:
+        points = centers[rng.integers(len(centers), size=count)]
+        return normalize(points + 0.6 * rng.standard_normal((count, dim)).astype(np.float32))
+
+    return sample(n), sample(n_queries)
+
+
+def configurations(n: int) -> list[tuple[str, dict]]:
+    nlist = max(16, min(4096, int(4 * np.sqrt(n)), n // 39))
+    configs = [("Flat", {})]
+    configs += [("HNSW32", {"efSearch": ef}) for ef in (16, 32, 64, 128, 256)]
+    configs += [(f"IVF{nlist},Flat", {"nprobe": p}) for p in (1, 4, 16, 64)]
+    configs += [(f"IVF{nlist},PQ32", {"nprobe": p}) for p in (4, 16, 64)]
+    return configs
+
+
+def timed_search(index, queries: np.ndarray, k: int) -> tuple[np.ndarray, float]:
+    index.search(queries[:1], k)  # aquecimento
+    start = time.perf_counter()
+    # Uma consulta de cada vez, como no matching de uma vaga
+    ids = np.vstack([index.search(query[None, :], k)[1] for query in queries])
+    return ids, (time.perf_counter() - start) / len(queries)
+
+
+def recall(found: np.ndarray, truth: np.ndarray) -> float:
+    return float(np.mean([len(set(a) & set(b)) / len(b) for a, b in zip(found, truth)]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=100_000, help="indexed vectors")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    vectors, queries = make_vectors(args.n, args.dim, args.queries)
+    labels = np.arange(args.n, dtype=np.int64)
+    print(f"{args.n:,} vectors, dim {args.dim}, {args.queries} queries, recall@{args.k}\n")
+    print(f"{'index':<22} {'params':<14} {'build s':>8} {'query ms':>9} {'recall':>7}")
+
+    built = {}
+    truth = None
+    for factory, params in configurations(args.n):
+        if factory not in built:
+            start = time.perf_counter()
+            index = new_faiss_index(args.dim, factory, vectors)
+            index.add_with_ids(vectors, labels)
+            built[factory] = (index, time.perf_counter() - start)
+        index, build_seconds = built[factory]
+
+        tune_index(index, params.get("efSearch", 0), params.get("nprobe", 0))
+        ids, latency = timed_search(index, queries, args.k)
+        if truth is None:
+            truth = ids  # Flat é exato
+        label = ", ".join(f"{key}={value}" for key, value in params.items()) or "-"
+        print(f"{factory:<22} {label:<14} {build_seconds:>8.2f} {latency * 1000:>9.3f} {recall(ids, truth):>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Throughput benchmark and parity check for the embedding backends.
+
+Encodes the same corpus with every backend (PyTorch, ONNX Runtime, ONNX
+Runtime with int8 dynamic quantization), reports sentences per second, and
+compares each backend against PyTorch:
+
+- per-sentence cosine similarity between the two embeddings of a text;
+- query/document cosine scores (the numbers matching actually ranks by) and
+  whether the top-k documents per query stay the same.
+
+The parity check fails if the mean embedding cosine drops below the threshold.
+Needs `sentence-transformers[onnx]` for the ONNX backends.
+
+Run from `backend/`:
+    python -m benchmarks.bench_embedding_backends [--model NAME] [--runs N]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from config import settings
+from services.model_registry import model_key, model_registry
+
+BACKENDS = [("torch", False), ("onnx", False), ("onnx", True)]
+
+TECHS = ["Python", "FastAPI", "React", "TypeScript", "PostgreSQL", "Docker", "Kubernetes",
+         "Go", "gRPC", "Rust", "PyTorch", "AWS", "Terraform", "Kafka", "Redis", "Django"]
+VERBS = ["Built", "Designed", "Migrated", "Optimized", "Led", "Automated", "Scaled", "Refactored"]
+THINGS = ["a REST API", "the billing pipeline", "an internal dashboard", "a recommendation service",
+          "the CI/CD setup", "a data warehouse", "the search backend", "a mobile app backend"]
+OUTCOMES = ["cutting latency by 40%", "serving 2M requests a day", "reducing cloud costs",
+            "for 30 enterprise customers", "with zero downtime", "improving test coverage to 90%"]
+
+
+def build_corpus(n_docs: int, n_queries: int, seed: int = 0) -> tuple[list[str], list[str]]:
+    rng = random.Random(seed)
+
+    def sentence() -> str:
+        return f"{rng.choice(VERBS)} {rng.choice(THINGS)} {rng.choice(OUTCOMES)}."
+
+    docs = [
+        f"[{', '.join(rng.sample(TECHS, 3))}] " + " ".join(sentence() for _ in range(rng.randint(1, 4)))
+        for _ in range(n_docs)
+    ]
+    queries = [
+        f"We are hiring an engineer with {', '.join(rng.sample(TECHS, 4))} experience. "
+        f"You will work on {rng.choice(THINGS)} and {rng.choice(THINGS)}."
+        for _ in range(n_queries)
+    ]
+    return docs, queries
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def throughput(model, texts: list[str], runs: int, batch_size: int) -> float:
+    model.encode(texts[:batch_size], batch_size=batch_size)  # aquecimento
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        model.encode(texts, batch_size=batch_size)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=settings.embedding_model)
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--min-cosine", type=float, default=0.99, help="parity threshold for fp32 ONNX")
+    parser.add_argument("--min-cosine-int8", type=float, default=0.95, help="parity threshold for int8 ONNX")
+    args = parser.parse_args()
+
+    docs, queries = build_corpus(args.docs, args.queries)
+    texts = docs + queries
+
+    results = {}
+    for backend, quantize in BACKENDS:
+        key = model_key(args.model, backend, quantize)
+        try:
+            load_time = model_registry.warmup(args.model, backend, quantize)
+        except Exception as e:
+            print(f"{key}: skipped ({type(e).__name__}: {e})")
+            continue
+        model = model_registry.get(args.model, backend, quantize)
+        sps = throughput(model, texts, args.runs, args.batch_size)
+        embeddings = normalize(model.encode(texts, batch_size=args.batch_size))
+        results[(backend, quantize)] = embeddings
+        print(f"{key}: load {load_time:.2f}s, {sps:,.0f} sentences/s")
+
+    reference = results.get(("torch", False))
+    if reference is None:
+        raise SystemExit("PyTorch backend unavailable: no reference for the parity check")
+
+    ref_scores = reference[len(docs):] @ reference[:len(docs)].T
+    ref_top = np.argsort(-ref_scores, axis=1)[:, :args.top_k]
+
+    failures = []
+    print()
+    for (backend, quantize), embeddings in results.items():
+        if backend == "torch":
+            continue
+        key = model_key(args.model, backend, quantize)
+        cosines = np.sum(embeddings * reference, axis=1)
+        scores = embeddings[len(docs):] @ embeddings[:len(docs)].T
+        top = np.argsort(-scores, axis=1)[:, :args.top_k]
+        overlap = np.mean([len(set(a) & set(b)) / args.top_k for a, b in zip(top, ref_top)])
+
+        print(f"{key} vs torch: embedding cosine mean {cosines.mean():.5f} / min {cosines.min():.5f}, "
+              f"max |score diff| {np.abs(scores - ref_scores).max():.5f}, top-{args.top_k} overlap {overlap:.1%}")
+
+        threshold = args.min_cosine_int8 if quantize else args.min_cosine
+        if cosines.mean() < threshold:
+            failures.append(f"{key}: mean cosine {cosines.mean():.5f} < {threshold}")
+
+    assert not failures, "Parity check failed:\n" + "\n".join(failures)
+    print("\nOK: parity within thresholds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Cold-start benchmark for the API process.
+
+Imports `main` in fresh interpreters with `python -X importtime`, reports the
+wall time and the slowest imports, and checks that the ML stack (torch,
+sentence_transformers, faiss) is *not* imported at startup; it should only be
+loaded when matching first happens.
+
+Run from `backend/`:
+    python -m benchmarks.bench_startup [--runs N] [--top N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("torch", "sentence_transformers", "faiss", "transformers")
+
+CHECK_SCRIPT = (
+    "import sys, main; "
+    f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+
+
+def run_importtime() -> list[tuple[int, int, str]]:
+    """`(self_us, cumulative_us, module)` for every import done by `import main`."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def time_cold_start(runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import main"], check=True, capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def heavy_modules_loaded() -> list[str]:
+    completed = subprocess.run(
+        [sys.executable, "-c", CHECK_SCRIPT], capture_output=True, text=True, check=True,
+    )
+    return [m for m in completed.stdout.strip().split(",") if m]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="cold starts to time")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args()
+
+    timings = time_cold_start(args.runs)
+    print(f"`import main` wall time over {args.runs} runs: "
+          f"median {statistics.median(timings) * 1000:.0f} ms, "
+          f"min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms")
+
+    rows = run_importtime()
+    total = next((cumulative for _, cumulative, name in rows if name.strip() == "main"), None)
+    if total is not None:
+        print(f"importtime cumulative for main: {total / 1000:.0f} ms")
+
+    print(f"\nSlowest {args.top} imports (cumulative):")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name.strip()}")
+
+    loaded = heavy_modules_loaded()
+    assert not loaded, f"ML stack imported at startup: {', '.join(loaded)}"
+    print(f"\nOK: none of {', '.join(HEAVY_MODULES)} imported by `import main`")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,10 +22,57 @@ class Settings(BaseSettings):
     
     # AI Model
     embedding_model: str = "paraphrase-multilingual-MiniLM-L12-v2"
+    embedding_backend: str = "torch"  # "torch" or "onnx" (ONNX Runtime, CPU)
+    embedding_quantize: bool = False  # int8 dynamic quantization (onnx backend only)
+    embedding_quantization_config: str = "avx2"  # arm64, avx2, avx512 or avx512_vnni
+    embedding_warmup: bool = True  # load the model at startup instead of on first match
+    query_cache_size: int = 256  # job-description embeddings kept in the LRU cache (0 disables)
+
+    # Chunked project indexing: one float16 vector per sentence group / achievement
+    embedding_chunking: bool = False
+    chunk_max_chars: int = 400  # sentences are grouped into chunks up to this size
+    chunk_pooling: str = "max"  # "max" or "topk_mean"
+    chunk_top_k: int = 2  # chunks averaged by "topk_mean"
+    embedding_batch_size: int = 64  # texts per encode_batch call when indexing in bulk
+
+    # Vector index: "Flat" (exact) or a faiss factory string such as "HNSW32" or "IVF1024,PQ32"
+    index_factory: str = "Flat"
+    index_min_train_size: int = 0  # vectors needed before training (0 = derived from the factory)
+    index_ef_search: int = 64  # HNSW: candidates explored per query (recall vs latency)
+    index_nprobe: int = 16  # IVF: inverted lists scanned per query
+    index_compact_ratio: float = 0.1  # HNSW: tombstoned share of vectors that triggers a background rebuild
+    index_save_interval_seconds: float = 30  # min time between snapshot writes after incremental changes (0 = every change)
+    index_change_retention_hours: int = 24  # queued index changes kept for lagging workers (older snapshots are rebuilt)
+
+    # Embedding server (python -m services.embedding_server); unset = load the model in-process.
+    # Micro-batching settings apply both in-process and in the server.
+    embedding_server_socket: Optional[str] = None
+    micro_batch_enabled: bool = True  # coalesce concurrent encode() calls in-process
+    micro_batch_max_size: int = 64  # texts gathered into one forward pass
+    micro_batch_max_wait_ms: float = 5  # how long the first request waits for company
+
+    # Bulk import
+    bulk_import_max_items: int = 5000
+    export_batch_size: int = 500  # rows fetched per round-trip when streaming exports
     
     # CV Generation
     max_projects_per_cv: int = 5
     similarity_threshold: float = 0.3
+    generation_workers: int = 2  # CV generation jobs running at once
+    generation_queue_size: int = 16  # jobs allowed to wait before new ones are rejected
+    generation_batch_max_items: int = 50
+
+    # LaTeX compilation
+    latex_engine: str = "pdflatex"
+    compile_workers: int = 2  # TeX engine processes running at once
+    compile_timeout_seconds: float = 60  # wall clock per engine run
+    compile_memory_limit_mb: int = 1024  # address space per engine run (0 = unlimited)
+    latex_max_passes: int = 3  # reruns only happen when the log asks for them
+
+    # PDF compile cache (under generated_dir/cache)
+    pdf_cache_enabled: bool = True
+    pdf_cache_max_bytes: int = 200 * 1024 * 1024
+    pdf_cache_max_age_seconds: int = 7 * 24 * 3600
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -1,18 +1,44 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from config import engine
-from models import Base
+from config import engine, settings
+from models import init_schema
+from repositories import GeneratedCVRepo
+from services import model_registry, generation_queue, compile_executor, LaTeXService
 from api import (
     profile,
     projects,
     experiences,
     templates,
     generate,
+    system,
 )
 
-app = FastAPI(title="CVForge API")
+logger = logging.getLogger(__name__)
 
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Carrega o modelo de embeddings uma vez, antes do primeiro pedido
+    if settings.embedding_server_socket:
+        logger.info("Using embedding server at %s", settings.embedding_server_socket)
+    elif settings.embedding_warmup:
+        load_time = model_registry.warmup(settings.embedding_model)
+        logger.info("Embedding model ready (%.2fs)", load_time)
+    templates = LaTeXService(settings.templates_dir, settings.generated_dir).warm_templates()
+    logger.info("Templates ready: %s", ", ".join(templates))
+    yield
+    cancelled = generation_queue.shutdown(wait=False)
+    if cancelled:
+        # As linhas pendentes destes jobs ficariam "queued" para sempre
+        GeneratedCVRepo().set_status([job.id for job in cancelled], "failed", cancelled[0].error)
+    compile_executor.shutdown(wait=False)
+
+
+app = FastAPI(title="CVForge API", lifespan=lifespan)
+
+init_schema(engine)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +54,7 @@ app.include_router(projects.router, prefix="/api/projects", tags=["Projects"])
 app.include_router(experiences.router, prefix="/api/experiences", tags=["Experiences"])
 app.include_router(templates.router, prefix="/api/templates", tags=["Templates"])
 app.include_router(generate.router, prefix="/api/generate", tags=["Generate"])
+app.include_router(system.router, prefix="/api/system", tags=["System"])
 
 @app.get("/")
 def root():
@@ -1,13 +1,19 @@
 from models.base import Base
 from models.cv_template import CVTemplate
+from models.embedding import Embedding
 from models.experience import Experience
 from models.generated_cv import GeneratedCV
+from models.index_change import IndexChange
 from models.project import Project
+from models.schema import init_schema
 
 __all__ = [
     "Base",
     "Project",
     "Experience",
     "CVTemplate",
-    "GeneratedCV"
+    "GeneratedCV",
+    "Embedding",
+    "IndexChange",
+    "init_schema"
 ]
@@ -0,0 +1,23 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, LargeBinary, DateTime, UniqueConstraint, func
+from models import Base
+from config import MAX_NAME_LENGTH
+
+
+class Embedding(Base):
+    """Cached embedding of an item's text, stored as raw little-endian bytes."""
+    __tablename__ = "embeddings"
+    __table_args__ = (
+        UniqueConstraint("kind", "item_id", "model_name", name="uq_embeddings_item_model"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    model_name: Mapped[str] = mapped_column(String(MAX_NAME_LENGTH), nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    dim: Mapped[int] = mapped_column(Integer, nullable=False)
+    dtype: Mapped[str] = mapped_column(String(16), nullable=False, default="float32")
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
@@ -1,13 +1,17 @@
 from typing import Optional
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Integer, Text, JSON, DateTime, func
+from sqlalchemy import String, Integer, Text, JSON, DateTime, Index, func
 from sqlalchemy.sql.sqltypes import Date
 from models import Base
 from config import MAX_NAME_LENGTH
 
 class Experience(Base):
     __tablename__ = "experiences"
+    __table_args__ = (
+        # Keyset pagination (created_at desc, id desc)
+        Index("ix_experiences_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True)
     position: Mapped[str] = mapped_column(String(MAX_NAME_LENGTH), nullable=False)
@@ -19,4 +23,7 @@ class Experience(Base):
     technologies: Mapped[list] = mapped_column(JSON, nullable=False)
     achievements: Mapped[list] = mapped_column(JSON, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+
+    def as_dict(self):
+        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
@@ -11,13 +11,19 @@ class GeneratedCV(Base):
     __tablename__ = "generated_cv"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    uid = Column(String(36), unique=True, index=True, nullable=True)
     template_id = Column(Integer, ForeignKey("cv_templates.id"), nullable=False, index=True)
     job_description = Column(Text, nullable=False)
     selected_projects = Column(JSON, nullable=True)
     selected_experiences = Column(JSON, nullable=True)
     selected_summary_label = Column(String(100), nullable=True)
     file_path = Column(String(MAX_PATH_LENGTH), nullable=False)
+    tex_path = Column(String(MAX_PATH_LENGTH), nullable=True)
     generation_time_seconds = Column(FLOAT, nullable=True)
-    created_at = Column(DateTime, default=func.now())
+    compile_passes = Column(Integer, nullable=True)  # 0 = PDF cache hit
+    # Jobs em segundo plano: queued/running/failed até terminarem; NULL = linha anterior aos jobs (done)
+    status = Column(String(20), nullable=True, index=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=func.now(), index=True)
 
     template = relationship("CVTemplate", back_populates="generated_cvs")
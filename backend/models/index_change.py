@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, DateTime, Index, func
+from models import Base
+
+
+class IndexChange(Base):
+    """
+    Queued vector-index work: one row per created, updated or deleted item,
+    written in the same transaction as the change. Every process applies the
+    rows past its own cursor on the next search.
+    """
+    __tablename__ = "index_changes"
+    __table_args__ = (
+        Index("ix_index_changes_kind_id", "kind", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
@@ -1,13 +1,17 @@
 from typing import Optional
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Integer, Text, JSON, DateTime, func
+from sqlalchemy import String, Integer, Text, JSON, DateTime, Index, func
 from models import Base
 from config import MAX_NAME_LENGTH
 
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Keyset pagination (created_at desc, id desc)
+        Index("ix_projects_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(MAX_NAME_LENGTH), nullable=False)
@@ -0,0 +1,103 @@
+import logging
+from sqlalchemy import Engine, inspect, text
+from models import Base
+
+logger = logging.getLogger(__name__)
+
+# Full-text indexes (SQLite FTS5): table -> (fts table, indexed columns, bm25 weights)
+FTS_TABLES = {
+    "projects": ("projects_fts", ("title", "description"), (10.0, 1.0)),
+    "experiences": ("experiences_fts", ("position", "company", "description"), (10.0, 5.0, 1.0)),
+}
+
+
+def _add_missing_columns(engine: Engine) -> None:
+    """
+    `create_all` only creates missing tables; add new nullable columns to
+    tables that already exist so older databases keep working.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                if not column.nullable:
+                    logger.warning(
+                        "Cannot add NOT NULL column %s.%s to an existing table",
+                        table.name, column.name
+                    )
+                    continue
+
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                logger.info("Added column %s.%s", table.name, column.name)
+
+
+def _create_missing_indexes(engine: Engine) -> None:
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def _create_fts_tables(engine: Engine) -> None:
+    """
+    External-content FTS5 tables kept in sync with their source tables by
+    triggers. Only on SQLite; other databases fall back to ILIKE search.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.begin() as conn:
+        for table, (fts_table, columns, _) in FTS_TABLES.items():
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": fts_table}
+            ).first()
+            if exists:
+                continue
+
+            cols = ", ".join(columns)
+            new_cols = ", ".join(f"new.{c}" for c in columns)
+            old_cols = ", ".join(f"old.{c}" for c in columns)
+
+            try:
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+                    f"{cols}, content='{table}', content_rowid='id', "
+                    f"tokenize='unicode61 remove_diacritics 2')"
+                ))
+            except Exception:
+                logger.warning("FTS5 is not available, search falls back to ILIKE")
+                return
+
+            conn.execute(text(
+                f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+            ))
+            conn.execute(text(
+                f"CREATE TRIGGER {fts_table}_au AFTER UPDATE ON {table} BEGIN "
+                f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+                f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+            ))
+            # Indexa as linhas que já existiam
+            conn.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"))
+            logger.info("Created full-text index %s", fts_table)
+
+
+def init_schema(engine: Engine) -> None:
+    """Create tables and bring existing ones up to date with the models."""
+    Base.metadata.create_all(bind=engine)
+    _add_missing_columns(engine)
+    _create_missing_indexes(engine)
+    _create_fts_tables(engine)
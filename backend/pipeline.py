@@ -46,7 +46,7 @@ def generate_cv(job_description: str, template: str = "basic") -> tuple[Path, li
     print("✅ LaTeX gerado com sucesso!")
 
     print("A compilar PDF...")
-    pdf_path = pdf.generate(tex_path)
+    pdf_path = pdf.generate(tex_path, template=template)
     print("✅ PDF gerado com sucesso!")
 
     selected_projects = [(m["project"], m["score"]) for m in matches]
@@ -1,7 +1,13 @@
 from repositories.project_repository import ProjectRepo
 from repositories.experience_repository import ExperienceRepo
+from repositories.embedding_repository import EmbeddingRepo
+from repositories.generated_cv_repository import GeneratedCVRepo
+from repositories.index_change_repository import IndexChangeRepo
 
 __all__ = [
     "ProjectRepo",
-    "ExperienceRepo"
+    "ExperienceRepo",
+    "EmbeddingRepo",
+    "GeneratedCVRepo",
+    "IndexChangeRepo"
 ]
\ No newline at end of file
@@ -0,0 +1,73 @@
+from typing import Sequence
+import numpy as np
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from config import get_db
+from models import Embedding
+
+
+class EmbeddingRepo:
+    def __init__(self):
+        self.session: Session = get_db()
+
+    def get_many(self, kind: str, item_ids: Sequence[int], model_name: str) -> dict[int, Embedding]:
+        if not item_ids:
+            return {}
+
+        stmt = select(Embedding).where(
+            Embedding.kind == kind,
+            Embedding.model_name == model_name,
+            Embedding.item_id.in_(item_ids),
+        )
+
+        with self.session.begin() as session:
+            rows = session.scalars(stmt).all()
+
+        return {row.item_id: row for row in rows}
+
+    def save_many(self, kind: str, model_name: str, entries: Sequence[tuple[int, str, np.ndarray]]) -> None:
+        """Insert or replace `(item_id, content_hash, vector)` entries."""
+        if not entries:
+            return
+
+        item_ids = [item_id for item_id, _, _ in entries]
+
+        with self.session.begin() as session:
+            existing = {
+                row.item_id: row
+                for row in session.scalars(
+                    select(Embedding).where(
+                        Embedding.kind == kind,
+                        Embedding.model_name == model_name,
+                        Embedding.item_id.in_(item_ids),
+                    )
+                )
+            }
+
+            for item_id, content_hash, vector in entries:
+                vector = np.asarray(vector)
+                row = existing.get(item_id)
+                if row is None:
+                    row = Embedding(kind=kind, item_id=item_id, model_name=model_name)
+                    session.add(row)
+                row.content_hash = content_hash
+                row.dim = vector.shape[-1]
+                row.dtype = vector.dtype.name
+                row.vector = vector.astype(vector.dtype.newbyteorder("<")).tobytes()
+
+    def delete(self, kind: str, item_ids: Sequence[int]) -> None:
+        stmt = delete(Embedding).where(Embedding.kind == kind, Embedding.item_id.in_(item_ids))
+
+        with self.session.begin() as session:
+            session.execute(stmt)
+
+    def delete_other_models(self, kind: str, model_name: str) -> None:
+        """Drop vectors computed by models other than `model_name`."""
+        stmt = delete(Embedding).where(Embedding.kind == kind, Embedding.model_name != model_name)
+
+        with self.session.begin() as session:
+            session.execute(stmt)
+
+    @staticmethod
+    def to_array(row: Embedding) -> np.ndarray:
+        return np.frombuffer(row.vector, dtype=np.dtype(row.dtype).newbyteorder("<")).reshape(-1, row.dim)
@@ -1,8 +1,16 @@
-from typing import Sequence, Optional
+import logging
+from typing import Iterator, Sequence, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select
 from config import get_db
 from models import Experience
+from repositories.index_change_repository import IndexChangeRepo
+from repositories.pagination import after_cursor, created_at_key, encode_cursor
+from repositories.search import fts_available, fts_matches, fts_query
+
+logger = logging.getLogger(__name__)
+
+INDEX_KIND = "experience"  # ExperienceIndex.kind
 
 
 class ExperienceRepo:
@@ -12,10 +20,31 @@ class ExperienceRepo:
     def create(self, experience: Experience) -> Experience:
         with self.session.begin() as session:
             session.add(experience)
+            session.flush()
+            # O índice vetorial aplica a alteração na próxima pesquisa
+            IndexChangeRepo.record(session, INDEX_KIND, [experience.id])
 
         return experience
 
+    def create_many(self, rows: Sequence[dict]) -> Sequence[Experience]:
+        """
+        Insert several experiences in one transaction (a single multi-row INSERT ... RETURNING).
+        They are queued for the vector index, which embeds them on the next search.
+        """
+        if not rows:
+            return []
+
+        with self.session.begin() as session:
+            created = session.scalars(insert(Experience).returning(Experience), list(rows)).all()
+            IndexChangeRepo.record(session, INDEX_KIND, [xp.id for xp in created])
+
+        return created
+
     def list(self, limit: int = 50, offset: int = 0, search: str | None = None) -> tuple[Sequence[Experience], int]:
+        query = fts_query(search) if search else None
+        if query and fts_available("experiences"):
+            return self._search(query, limit=limit, offset=offset)
+
         stmt = select(Experience)
 
         if search:
@@ -41,6 +70,64 @@ class ExperienceRepo:
 
         return experiences, total
 
+    def list_page(
+        self,
+        limit: int = 50,
+        after: tuple[str, int] | None = None,
+        offset: int = 0,
+        include_total: bool = True,
+    ) -> tuple[Sequence[Experience], int | None, str | None]:
+        """
+        Newest-first page using keyset pagination on `(created_at, id)`.
+        Returns the rows, the total (None if not requested) and the cursor of the
+        next page (None on the last page).
+        """
+        stmt = select(Experience, created_at_key(Experience))
+        if after is not None:
+            stmt = stmt.where(after_cursor(Experience, after))
+        stmt = stmt.order_by(Experience.created_at.desc(), Experience.id.desc()).offset(offset).limit(limit)
+
+        with self.session.begin() as session:
+            total = session.scalar(select(func.count(Experience.id))) if include_total else None
+            rows = session.execute(stmt).all()
+
+        experiences = [row[0] for row in rows]
+        next_cursor = None
+        if len(rows) == limit:
+            last, last_created_at = rows[-1]
+            next_cursor = encode_cursor(last_created_at, last.id)
+
+        return experiences, total, next_cursor
+
+    def _search(self, query: str, limit: int, offset: int) -> tuple[Sequence[Experience], int]:
+        """Full-text search through the FTS5 index, ranked by BM25."""
+        ranked, total_stmt = fts_matches("experiences", query)
+        stmt = (
+            select(Experience)
+            .join(ranked, ranked.c.id == Experience.id)
+            .order_by(ranked.c.rank)
+            .offset(offset)
+            .limit(limit)
+        )
+
+        with self.session.begin() as session:
+            total = session.scalar(total_stmt)
+            experiences = session.scalars(stmt).all()
+
+        return experiences, total
+
+    def iter_batches(self, batch_size: int = 500) -> Iterator[Sequence[Experience]]:
+        """
+        Yield every experience in id order, `batch_size` rows at a time, streaming from the
+        cursor (`yield_per`) so memory use doesn't grow with the table.
+        """
+        stmt = select(Experience).order_by(Experience.id).execution_options(yield_per=batch_size)
+
+        with self.session.begin() as session:
+            for batch in session.scalars(stmt).partitions():
+                # O identity map é fraco: cada lote é libertado quando deixa de ser usado
+                yield batch
+
     def get_by_id(self, id: int) -> Optional[Experience]:
         stmt = select(Experience).where(Experience.id == id)
 
@@ -49,22 +136,42 @@ class ExperienceRepo:
 
         return result
 
-    def update(self, id: int, experience: Experience) -> Experience:
-        existing_experience = self.get_by_id(id)
-        if existing_experience:
+    def get_many(self, ids: Sequence[int]) -> Sequence[Experience]:
+        """Fetch several experiences in one query, in the order of `ids` (missing ids are skipped)."""
+        if not ids:
+            return []
+
+        stmt = select(Experience).where(Experience.id.in_(set(ids)))
+
+        with self.session.begin() as session:
+            by_id = {xp.id: xp for xp in session.scalars(stmt)}
+
+        return [by_id[id] for id in ids if id in by_id]
+
+    def update(self, id: int, experience: Experience) -> Optional[Experience]:
+        with self.session.begin() as session:
+            existing_experience = session.get(Experience, id)
+            if existing_experience is None:
+                return None
+
             for key, value in experience.__dict__.items():
-                if key != '_sa_instance_state':
+                if key != '_sa_instance_state' and value is not None:
                     setattr(existing_experience, key, value)
-            self.session.commit()
-            self.session.refresh(existing_experience)
-            return existing_experience
-        return None
+
+            session.flush()
+            session.refresh(existing_experience)
+            IndexChangeRepo.record(session, INDEX_KIND, [id])
+
+        return existing_experience
 
     def delete(self, id: int) -> bool:
         stmt = select(Experience).where(Experience.id == id)
 
         with self.session.begin() as session:
             result = session.scalar(stmt)
+            if result is None:
+                return False
             session.delete(result)
+            IndexChangeRepo.record(session, INDEX_KIND, [id])
 
-        return True
\ No newline at end of file
+        return True
@@ -0,0 +1,97 @@
+from typing import Sequence, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, select, update
+from config import get_db, settings
+from models import CVTemplate, GeneratedCV
+
+DONE = "done"
+
+
+class GeneratedCVRepo:
+    def __init__(self):
+        self.session: Session = get_db()
+
+    def _get_or_create_template(self, session: Session, template_name: str) -> CVTemplate:
+        stmt = select(CVTemplate).where(CVTemplate.name == template_name)
+        template = session.scalar(stmt)
+        if template is not None:
+            return template
+
+        template = CVTemplate(
+            name=template_name,
+            file_path=str(settings.templates_dir / f"{template_name}.tex"),
+            is_active=True
+        )
+        try:
+            # Savepoint: se outro pedido criou o template entretanto, só este INSERT é desfeito
+            with session.begin_nested():
+                session.add(template)
+        except IntegrityError:
+            template = session.scalar(stmt)
+        return template
+
+    def create(self, cv: GeneratedCV, template_name: str) -> GeneratedCV:
+        """Store a finished CV, filling in the pending row of its background job if there is one."""
+        with self.session.begin() as session:
+            cv.template_id = self._get_or_create_template(session, template_name).id
+            cv.status = DONE
+            pending_id = None
+            if cv.uid is not None:
+                pending_id = session.scalar(select(GeneratedCV.id).where(GeneratedCV.uid == cv.uid))
+            if pending_id is None:
+                session.add(cv)
+            else:
+                cv.id = pending_id
+                cv = session.merge(cv)
+
+        return cv
+
+    def create_pending(self, uid: str, job_description: str | None, template_name: str, status: str) -> GeneratedCV:
+        """Row for a background job, so any worker can report its status."""
+        cv = GeneratedCV(uid=uid, job_description=job_description or "", file_path="", status=status)
+        with self.session.begin() as session:
+            cv.template_id = self._get_or_create_template(session, template_name).id
+            session.add(cv)
+
+        return cv
+
+    def set_status(self, uids: Sequence[str], status: str, error: str | None = None) -> None:
+        """Move background jobs that haven't finished yet to `status`."""
+        if not uids:
+            return
+
+        stmt = (
+            update(GeneratedCV)
+            .where(GeneratedCV.uid.in_(uids), GeneratedCV.status.is_not(None), GeneratedCV.status != DONE)
+            .values(status=status, error=error)
+        )
+
+        with self.session.begin() as session:
+            session.execute(stmt)
+
+    def delete_pending(self, uid: str) -> None:
+        stmt = delete(GeneratedCV).where(GeneratedCV.uid == uid, GeneratedCV.status != DONE)
+
+        with self.session.begin() as session:
+            session.execute(stmt)
+
+    def get_by_uid(self, uid: str) -> Optional[GeneratedCV]:
+        stmt = select(GeneratedCV).where(GeneratedCV.uid == uid)
+
+        with self.session.begin() as session:
+            result = session.scalar(stmt)
+
+        return result
+
+    def list(self, limit: int = 50, offset: int = 0) -> tuple[Sequence[GeneratedCV], int]:
+        """Finished CVs, newest first (background jobs still pending or failed are left out)."""
+        finished = GeneratedCV.status.is_(None) | (GeneratedCV.status == DONE)
+        stmt = select(GeneratedCV).where(finished).order_by(GeneratedCV.created_at.desc()).offset(offset).limit(limit)
+        total_stmt = select(func.count(GeneratedCV.id)).where(finished)
+
+        with self.session.begin() as session:
+            total = session.scalar(total_stmt)
+            cvs = session.scalars(stmt).all()
+
+        return cvs, total
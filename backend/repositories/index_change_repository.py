@@ -0,0 +1,47 @@
+import datetime
+from typing import Iterable, Sequence
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, select
+from config import get_db
+from models import IndexChange
+
+
+class IndexChangeRepo:
+    def __init__(self):
+        self.session: Session = get_db()
+
+    @staticmethod
+    def record(session: Session, kind: str, item_ids: Iterable[int]) -> None:
+        """Queue index work for `item_ids`, inside the caller's transaction."""
+        rows = [{"kind": kind, "item_id": item_id} for item_id in item_ids]
+        if rows:
+            session.execute(insert(IndexChange), rows)
+
+    def since(self, kind: str, after_id: int, limit: int = 1000) -> Sequence[tuple[int, int]]:
+        """`(change_id, item_id)` pairs queued after `after_id`, oldest first."""
+        stmt = (
+            select(IndexChange.id, IndexChange.item_id)
+            .where(IndexChange.kind == kind, IndexChange.id > after_id)
+            .order_by(IndexChange.id)
+            .limit(limit)
+        )
+
+        with self.session.begin() as session:
+            return [tuple(row) for row in session.execute(stmt)]
+
+    def last_id(self, kind: str) -> int:
+        with self.session.begin() as session:
+            return session.scalar(select(func.max(IndexChange.id)).where(IndexChange.kind == kind)) or 0
+
+    def prune(self, kind: str, up_to_id: int, older_than: datetime.timedelta) -> int:
+        """Drop changes up to `up_to_id` that are older than `older_than` (by database time)."""
+        with self.session.begin() as session:
+            cutoff = session.scalar(select(func.now())) - older_than
+            result = session.execute(
+                delete(IndexChange).where(
+                    IndexChange.kind == kind,
+                    IndexChange.id <= up_to_id,
+                    IndexChange.created_at < cutoff,
+                )
+            )
+        return result.rowcount
@@ -0,0 +1,33 @@
+import base64
+import json
+from sqlalchemy import String, cast, literal, tuple_
+
+
+def encode_cursor(created_at: str, id: int) -> str:
+    """Opaque `after` token for keyset pagination over `(created_at, id)`."""
+    raw = json.dumps([created_at, id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[str, int]:
+    """Inverse of `encode_cursor`. Raises ValueError on a malformed token."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_at, id = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(created_at, str) or not isinstance(id, int):
+        raise ValueError("Invalid pagination cursor")
+    return created_at, id
+
+
+def created_at_key(model):
+    # created_at como é guardado na BD: comparar com o valor re-serializado pelo
+    # Python (com microssegundos) falharia em linhas criadas no mesmo segundo
+    return cast(model.created_at, String).label("created_at_key")
+
+
+def after_cursor(model, cursor: tuple[str, int]):
+    """Rows strictly after `cursor` in `created_at desc, id desc` order."""
+    created_at, id = cursor
+    return tuple_(model.created_at, model.id) < tuple_(literal(created_at, String), literal(id))
@@ -1,8 +1,16 @@
-from typing import Sequence, Optional
+import logging
+from typing import Iterator, Sequence, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select
 from config import get_db
 from models import Project
+from repositories.index_change_repository import IndexChangeRepo
+from repositories.pagination import after_cursor, created_at_key, encode_cursor
+from repositories.search import fts_available, fts_matches, fts_query
+
+logger = logging.getLogger(__name__)
+
+INDEX_KIND = "project"  # ProjectIndex.kind
 
 
 class ProjectRepo:
@@ -12,10 +20,31 @@ class ProjectRepo:
     def create(self, project: Project) -> Project:
         with self.session.begin() as session:
             session.add(project)
+            session.flush()
+            # O índice vetorial aplica a alteração na próxima pesquisa
+            IndexChangeRepo.record(session, INDEX_KIND, [project.id])
 
         return project
 
+    def create_many(self, rows: Sequence[dict]) -> Sequence[Project]:
+        """
+        Insert several projects in one transaction (a single multi-row INSERT ... RETURNING).
+        They are queued for the vector index, which embeds them on the next search.
+        """
+        if not rows:
+            return []
+
+        with self.session.begin() as session:
+            created = session.scalars(insert(Project).returning(Project), list(rows)).all()
+            IndexChangeRepo.record(session, INDEX_KIND, [p.id for p in created])
+
+        return created
+
     def list(self, limit: int = 50, offset: int = 0, search: str | None = None) -> tuple[Sequence[Project], int]:
+        query = fts_query(search) if search else None
+        if query and fts_available("projects"):
+            return self._search(query, limit=limit, offset=offset)
+
         stmt = select(Project)
 
         if search:
@@ -39,6 +68,52 @@ class ProjectRepo:
 
         return projects, total
 
+    def list_page(
+        self,
+        limit: int = 50,
+        after: tuple[str, int] | None = None,
+        offset: int = 0,
+        include_total: bool = True,
+    ) -> tuple[Sequence[Project], int | None, str | None]:
+        """
+        Newest-first page using keyset pagination on `(created_at, id)`.
+        Returns the rows, the total (None if not requested) and the cursor of the
+        next page (None on the last page).
+        """
+        stmt = select(Project, created_at_key(Project))
+        if after is not None:
+            stmt = stmt.where(after_cursor(Project, after))
+        stmt = stmt.order_by(Project.created_at.desc(), Project.id.desc()).offset(offset).limit(limit)
+
+        with self.session.begin() as session:
+            total = session.scalar(select(func.count(Project.id))) if include_total else None
+            rows = session.execute(stmt).all()
+
+        projects = [row[0] for row in rows]
+        next_cursor = None
+        if len(rows) == limit:
+            last, last_created_at = rows[-1]
+            next_cursor = encode_cursor(last_created_at, last.id)
+
+        return projects, total, next_cursor
+
+    def _search(self, query: str, limit: int, offset: int) -> tuple[Sequence[Project], int]:
+        """Full-text search through the FTS5 index, ranked by BM25."""
+        ranked, total_stmt = fts_matches("projects", query)
+        stmt = (
+            select(Project)
+            .join(ranked, ranked.c.id == Project.id)
+            .order_by(ranked.c.rank)
+            .offset(offset)
+            .limit(limit)
+        )
+
+        with self.session.begin() as session:
+            total = session.scalar(total_stmt)
+            projects = session.scalars(stmt).all()
+
+        return projects, total
+
     def list_all(self):
         stmt = select(Project)
 
@@ -47,6 +122,18 @@ class ProjectRepo:
 
         return list
 
+    def iter_batches(self, batch_size: int = 500) -> Iterator[Sequence[Project]]:
+        """
+        Yield every project in id order, `batch_size` rows at a time, streaming from the
+        cursor (`yield_per`) so memory use doesn't grow with the table.
+        """
+        stmt = select(Project).order_by(Project.id).execution_options(yield_per=batch_size)
+
+        with self.session.begin() as session:
+            for batch in session.scalars(stmt).partitions():
+                # O identity map é fraco: cada lote é libertado quando deixa de ser usado
+                yield batch
+
     def get_by_id(self, id: int) -> Optional[Project]:
         stmt = select(Project).where(Project.id == id)
 
@@ -55,15 +142,42 @@ class ProjectRepo:
 
         return result
 
-    def update(self, id: int, project: Project) -> Project:
-        #TODO: find project → update project → return updated project
-        return project
+    def get_many(self, ids: Sequence[int]) -> Sequence[Project]:
+        """Fetch several projects in one query, in the order of `ids` (missing ids are skipped)."""
+        if not ids:
+            return []
+
+        stmt = select(Project).where(Project.id.in_(set(ids)))
+
+        with self.session.begin() as session:
+            by_id = {p.id: p for p in session.scalars(stmt)}
+
+        return [by_id[id] for id in ids if id in by_id]
+
+    def update(self, id: int, project: Project) -> Optional[Project]:
+        with self.session.begin() as session:
+            existing_project = session.get(Project, id)
+            if existing_project is None:
+                return None
+
+            for key, value in project.__dict__.items():
+                if key != '_sa_instance_state' and value is not None:
+                    setattr(existing_project, key, value)
+
+            session.flush()
+            session.refresh(existing_project)
+            IndexChangeRepo.record(session, INDEX_KIND, [id])
+
+        return existing_project
 
     def delete(self, id: int) -> bool:
         stmt = select(Project).where(Project.id == id)
 
         with self.session.begin() as session:
             result = session.scalar(stmt)
+            if result is None:
+                return False
             session.delete(result)
+            IndexChangeRepo.record(session, INDEX_KIND, [id])
 
         return True
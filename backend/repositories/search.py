@@ -0,0 +1,66 @@
+import re
+from sqlalchemy import Select, func, literal_column, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from config import engine
+from models.schema import FTS_TABLES
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Só resultados positivos ficam em cache: uma sonda falhada (BD ainda sem
+# schema, corrida com init_schema) não desliga o FTS até ao fim do processo
+_fts_tables: set[str] = set()
+
+
+def fts_query(search: str) -> str | None:
+    """
+    Turn free text into an FTS5 query: every word must match, as a prefix.
+    Returns None when the text has no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(search)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def fts_available(table: str) -> bool:
+    """True if `table` has an FTS5 index (created by `init_schema` on SQLite)."""
+    if table in _fts_tables:
+        return True
+    if engine.dialect.name != "sqlite" or table not in FTS_TABLES:
+        return False
+
+    try:
+        with engine.connect() as conn:
+            found = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": FTS_TABLES[table][0]}
+            ).first() is not None
+    except SQLAlchemyError:
+        return False
+
+    if found:
+        _fts_tables.add(table)
+    return found
+
+
+def fts_matches(table: str, query: str):
+    """
+    Subquery of `(id, rank)` for rows of `table` matching `query`, ranked by BM25
+    (lower is better), plus a statement counting the matches from the same index.
+    """
+    fts_table, _, weights = FTS_TABLES[table]
+    match = text(f"{fts_table} MATCH :fts_query").bindparams(fts_query=query)
+    bm25 = ", ".join(str(w) for w in weights)
+
+    ranked = (
+        select(
+            literal_column("rowid").label("id"),
+            literal_column(f"bm25({fts_table}, {bm25})").label("rank"),
+        )
+        .select_from(text(fts_table))
+        .where(match)
+        .subquery()
+    )
+    count_stmt: Select = select(func.count()).select_from(text(fts_table)).where(match)
+
+    return ranked, count_stmt
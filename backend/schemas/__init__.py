@@ -11,6 +11,11 @@ from schemas.experience import (
     ExperienceResponse,
     ExperienceListResponse
 )
+from schemas.bulk import (
+    BulkImportError,
+    BulkImportTimings,
+    BulkImportResponse
+)
 
 __all__ = [
     "ProjectCreate",
@@ -21,5 +26,8 @@ __all__ = [
     "ExperienceCreate",
     "ExperienceUpdate",
     "ExperienceResponse",
-    "ExperienceListResponse"
+    "ExperienceListResponse",
+    "BulkImportError",
+    "BulkImportTimings",
+    "BulkImportResponse"
 ]
\ No newline at end of file
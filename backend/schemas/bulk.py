@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class BulkImportError(BaseModel):
+    line: int
+    error: str
+
+
+class BulkImportTimings(BaseModel):
+    parse_seconds: float
+    insert_seconds: float
+    total_seconds: float
+
+
+class BulkImportResponse(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    ids: List[int]
+    errors: List[BulkImportError]
+    timings: BulkImportTimings
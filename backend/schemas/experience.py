@@ -32,7 +32,8 @@ class ExperienceResponse(ExperienceCreate):
 
 class ExperienceListResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
-    total: int
+    total: Optional[int] = None
     offset: int
     limit: int
+    next_cursor: Optional[str] = None
     experiences: List[ExperienceResponse]
\ No newline at end of file
@@ -31,9 +31,10 @@ class ProjectResponse(ProjectCreate):
 
 class ProjectListResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
-    total: int
+    total: Optional[int] = None
     offset: int
     limit: int
+    next_cursor: Optional[str] = None
     projects: List[ProjectResponse]
 
 class ProjectMatchs(BaseModel):
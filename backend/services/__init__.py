@@ -1,14 +1,76 @@
-from services.embedding_service import EmbeddingService
-from services.latex_service import LaTeXService
-from services.pdf_generator import PDFGeneratorService
-from services.profile_service import ProfileData, ProfileService
-from services.project_matcher import ProjectMatcherService
-
-__all__ = [
-    "ProfileData",
-    "ProfileService",
-    "EmbeddingService",
-    "ProjectMatcherService",
-    "LaTeXService",
-    "PDFGeneratorService",
-]
+"""
+Services are imported lazily (PEP 562): `from services import LaTeXService`
+only loads the LaTeX module, so CRUD-only code paths never pull in numpy-heavy
+matching code, faiss or torch until something actually needs them.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+# Singletons with the same name as their module are bound eagerly: importing the
+# submodule later would otherwise set `services.<name>` to the module itself.
+# These modules are light (no faiss/torch).
+from services.model_registry import model_registry
+from services.query_cache import query_cache
+from services.pdf_cache import pdf_cache
+from services.compile_executor import compile_executor
+
+_EXPORTS = {
+    "ProfileData": "services.profile_service",
+    "ProfileService": "services.profile_service",
+    "ModelRegistry": "services.model_registry",
+    "MicroBatcher": "services.micro_batcher",
+    "QueryEmbeddingCache": "services.query_cache",
+    "EmbeddingService": "services.embedding_service",
+    "VectorIndex": "services.vector_index",
+    "ProjectIndex": "services.project_index",
+    "get_project_index": "services.project_index",
+    "ExperienceIndex": "services.experience_index",
+    "get_experience_index": "services.experience_index",
+    "ProjectMatcherService": "services.project_matcher",
+    "ExperienceMatcherService": "services.experience_matcher",
+    "LaTeXService": "services.latex_service",
+    "PDFCache": "services.pdf_cache",
+    "CompileError": "services.compile_executor",
+    "CompileExecutor": "services.compile_executor",
+    "CompileResult": "services.compile_executor",
+    "PDFBuild": "services.pdf_generator",
+    "PDFGeneratorService": "services.pdf_generator",
+    "Job": "services.job_queue",
+    "JobQueue": "services.job_queue",
+    "JobStatus": "services.job_queue",
+    "QueueFullError": "services.job_queue",
+    "generation_queue": "services.job_queue",
+}
+
+__all__ = list(_EXPORTS) + ["model_registry", "query_cache", "pdf_cache", "compile_executor"]
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # próximos acessos não passam por aqui
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+
+if TYPE_CHECKING:
+    from services.model_registry import ModelRegistry
+    from services.micro_batcher import MicroBatcher
+    from services.query_cache import QueryEmbeddingCache
+    from services.embedding_service import EmbeddingService
+    from services.vector_index import VectorIndex
+    from services.project_index import ProjectIndex, get_project_index
+    from services.latex_service import LaTeXService
+    from services.pdf_cache import PDFCache
+    from services.compile_executor import CompileError, CompileExecutor, CompileResult
+    from services.pdf_generator import PDFBuild, PDFGeneratorService
+    from services.profile_service import ProfileData, ProfileService
+    from services.experience_index import ExperienceIndex, get_experience_index
+    from services.project_matcher import ProjectMatcherService
+    from services.experience_matcher import ExperienceMatcherService
+    from services.job_queue import Job, JobQueue, JobStatus, QueueFullError, generation_queue
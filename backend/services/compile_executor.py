@@ -0,0 +1,209 @@
+import logging
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Só guardamos o fim do log: é lá que o TeX explica porque falhou
+LOG_TAIL_CHARS = 8000
+
+# Avisos do LaTeX/pacotes que pedem outra passagem (referências, TOC, hyperref...)
+RERUN_PATTERN = re.compile(r"Rerun to get|Please rerun LaTeX|Rerun LaTeX")
+
+
+class CompileError(RuntimeError):
+    def __init__(self, message: str, result: "CompileResult"):
+        super().__init__(message)
+        self.result = result
+
+
+@dataclass
+class CompileResult:
+    tex_path: Path
+    pdf_path: Optional[Path]
+    returncode: Optional[int]
+    timed_out: bool
+    duration_seconds: float
+    log: str
+    needs_rerun: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out and self.pdf_path is not None
+
+
+def _limit_memory(cmd: List[str], max_bytes: int) -> List[str]:
+    """
+    Wrap `cmd` so it runs with its address space capped (POSIX only). A shell
+    sets the limit and execs the engine; preexec_fn is not safe to use from a
+    multi-threaded server, since the child can deadlock between fork and exec.
+    """
+    if max_bytes <= 0 or os.name != "posix":
+        return cmd
+    # exec: o motor herda o PID (e o grupo de processos) da shell
+    return ["/bin/sh", "-c", f'ulimit -v {max(1, max_bytes // 1024)} && exec "$@"', "sh", *cmd]
+
+
+class CompileExecutor(object):
+    """
+    Bounded pool of TeX engine subprocesses.
+
+    At most `max_workers` engines run at once, whether compiles come from the
+    request threads (`compile`) or from the pool itself (`submit`). Every run
+    gets a wall-clock timeout and an address-space limit, runs in its own
+    process group so a timeout kills the whole tree, and keeps the tail of
+    its log for error reports.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        timeout_seconds: float,
+        memory_limit_bytes: int,
+        engine: str = "pdflatex",
+    ):
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_bytes = memory_limit_bytes
+        self.engine = engine
+
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="tex-compile",
+                )
+            return self._executor
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Run `fn` (typically something that ends in `compile`) on the pool."""
+        return self._get_executor().submit(fn, *args, **kwargs)
+
+    def run(self, tex_path: Path, build_dir: Path) -> CompileResult:
+        """Run one engine pass over `tex_path`, writing outputs to `build_dir`."""
+        tex_path = Path(tex_path).absolute()
+        build_dir = Path(build_dir).absolute()
+        cmd = [
+            self.engine,
+            "-interaction=nonstopmode",
+            "-halt-on-error",
+            f"-output-directory={build_dir}",
+            tex_path.name,
+        ]
+
+        with self._slots:
+            with self._lock:
+                self.running += 1
+            start = time.perf_counter()
+            timed_out = False
+            try:
+                proc = subprocess.Popen(
+                    _limit_memory(cmd, self.memory_limit_bytes),
+                    cwd=tex_path.parent,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True,
+                )
+                try:
+                    output, _ = proc.communicate(timeout=self.timeout_seconds)
+                except subprocess.TimeoutExpired:
+                    timed_out = True
+                    self._kill(proc)
+                    output, _ = proc.communicate()
+            finally:
+                duration = time.perf_counter() - start
+                with self._lock:
+                    self.running -= 1
+
+        pdf_path = build_dir / tex_path.with_suffix(".pdf").name
+        log_path = build_dir / tex_path.with_suffix(".log").name
+        log = log_path.read_text(encoding="utf-8", errors="replace") if log_path.exists() else ""
+        if not log:
+            log = output.decode("utf-8", errors="replace")
+
+        result = CompileResult(
+            tex_path=tex_path,
+            pdf_path=pdf_path if pdf_path.exists() else None,
+            returncode=None if timed_out else proc.returncode,
+            timed_out=timed_out,
+            duration_seconds=duration,
+            log=log[-LOG_TAIL_CHARS:],
+            needs_rerun=bool(RERUN_PATTERN.search(log)),
+        )
+
+        with self._lock:
+            if result.ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+                self.timeouts += int(timed_out)
+        return result
+
+    def compile(self, tex_path: Path, build_dir: Path) -> CompileResult:
+        """`run`, raising `CompileError` (with the log tail) unless a PDF was produced."""
+        result = self.run(tex_path, build_dir)
+        if result.timed_out:
+            raise CompileError(
+                f"LaTeX compilation timed out after {self.timeout_seconds}s", result
+            )
+        if not result.ok:
+            raise CompileError(
+                f"LaTeX compilation failed (returncode={result.returncode}). Log:\n{result.log[-2000:]}",
+                result,
+            )
+        logger.debug("Compiled %s in %.2fs", result.tex_path.name, result.duration_seconds)
+        return result
+
+    @staticmethod
+    def _kill(proc: subprocess.Popen) -> None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        except OSError:
+            proc.kill()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "engine": self.engine,
+            "max_workers": self.max_workers,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Singleton instance
+compile_executor = CompileExecutor(
+    settings.compile_workers,
+    timeout_seconds=settings.compile_timeout_seconds,
+    memory_limit_bytes=settings.compile_memory_limit_mb * 1024 * 1024,
+    engine=settings.latex_engine,
+)
@@ -0,0 +1,84 @@
+import logging
+import socket
+import threading
+from typing import List
+
+import numpy as np
+
+from config import settings
+from services.embedding_server import read_shared, recv_message, send_message
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingServerError(RuntimeError):
+    pass
+
+
+class RemoteEmbeddingModel(object):
+    """
+    Stand-in for a SentenceTransformer that forwards `encode` to the embedding
+    server (`python -m services.embedding_server`). Each thread keeps its own
+    connection and reconnects once if the server restarted.
+    """
+
+    def __init__(self, socket_path: str, model_name: str, timeout: float = 60):
+        self.socket_path = socket_path
+        self.model_name = model_name
+        self.timeout = timeout
+        self._local = threading.local()
+        self._dimension: int | None = None
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise EmbeddingServerError(f"Embedding server not reachable at {self.socket_path}: {e}")
+        return sock
+
+    def _request(self, message: dict) -> dict:
+        for attempt in range(2):
+            sock = getattr(self._local, "sock", None)
+            if sock is None:
+                sock = self._local.sock = self._connect()
+            try:
+                send_message(sock, message)
+                response = recv_message(sock)
+                if response is None:
+                    raise ConnectionError("connection closed by embedding server")
+            except OSError as e:
+                sock.close()
+                self._local.sock = None
+                if attempt == 1:
+                    raise EmbeddingServerError(f"Embedding server request failed: {e}")
+                logger.info("Reconnecting to embedding server after: %s", e)
+                continue
+
+            if "error" in response:
+                raise EmbeddingServerError(response["error"])
+            return response
+
+    def _model_fields(self) -> dict:
+        # O servidor carrega o modelo com o backend pedido por este processo
+        return {
+            "model": self.model_name,
+            "backend": settings.embedding_backend,
+            "quantize": settings.embedding_quantize,
+        }
+
+    def get_sentence_embedding_dimension(self) -> int:
+        if self._dimension is None:
+            self._dimension = self._request({"op": "dimension", **self._model_fields()})["dimension"]
+        return self._dimension
+
+    def encode(self, sentences: str | List[str], **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        vectors = read_shared(self._request({"op": "encode", **self._model_fields(), "texts": texts}))
+        return vectors[0] if single else vectors
@@ -0,0 +1,201 @@
+"""
+Standalone embedding server: one process owns the SentenceTransformer models and
+serves every API worker over a Unix socket.
+
+Concurrent requests are micro-batched into a single `model.encode` call. The
+vectors go back through `multiprocessing.shared_memory`; only a small JSON
+header travels over the socket.
+
+Run from `backend/`:
+    python -m services.embedding_server [--socket PATH] [--model NAME]
+
+and point the API at it with `EMBEDDING_SERVER_SOCKET=PATH`.
+"""
+import argparse
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+
+from config import settings
+from services.micro_batcher import MicroBatcher
+from services.model_registry import model_key, model_registry
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("!I")
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    payload = json.dumps(message).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_message(sock: socket.socket) -> Dict[str, Any] | None:
+    """Read one length-prefixed JSON message; None when the peer closed the connection."""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    payload = _recv_exact(sock, _HEADER.unpack(header)[0])
+    if payload is None:
+        return None
+    return json.loads(payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes | None:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            return None
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128  # vários workers ligam-se ao mesmo tempo
+
+    def __init__(self, socket_path: Path, max_batch: int, max_wait_seconds: float):
+        self.socket_path = Path(socket_path)
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        self.max_batch = max_batch
+        self.max_wait_seconds = max_wait_seconds
+        self._batchers: Dict[str, MicroBatcher] = {}
+        self._lock = threading.Lock()
+        super().__init__(str(self.socket_path), _Handler)
+
+    def batcher(self, model_name: str, backend: str | None, quantize: bool | None) -> MicroBatcher:
+        key = model_key(model_name, backend, quantize)
+        with self._lock:
+            if key not in self._batchers:
+                model = model_registry.get(model_name, backend, quantize)
+                self._batchers[key] = MicroBatcher(
+                    model.encode, self.max_batch, self.max_wait_seconds, name=key
+                )
+            return self._batchers[key]
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: EmbeddingServer
+
+    def handle(self) -> None:
+        # Bloco de memória partilhada da última resposta. O cliente apaga-o ao
+        # ler; se desligar antes disso, é o servidor que limpa.
+        sent_block: str | None = None
+        try:
+            # Uma ligação pode fazer vários pedidos seguidos
+            while True:
+                request = recv_message(self.request)
+                # Novo pedido ou fim da ligação: o bloco anterior já não vai ser lido
+                discard_shared(sent_block)
+                sent_block = None
+                if request is None:
+                    return
+                try:
+                    response = self._dispatch(request)
+                except Exception as e:
+                    logger.exception("Request failed")
+                    response = {"error": f"{type(e).__name__}: {e}"}
+                sent_block = response.get("shm")
+                send_message(self.request, response)
+        except OSError as e:
+            logger.debug("Client went away: %s", e)
+        finally:
+            discard_shared(sent_block)
+
+    def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        model = (request["model"], request.get("backend"), request.get("quantize"))
+        if request.get("op") == "dimension":
+            return {"dimension": model_registry.get(*model).get_sentence_embedding_dimension()}
+
+        vectors = self.server.batcher(*model).submit(request["texts"])
+        return write_shared(vectors)
+
+
+def write_shared(vectors: np.ndarray) -> Dict[str, Any]:
+    """
+    Copy `vectors` into a new shared memory block and describe it. The client
+    reads and unlinks the block, so the server stops tracking it; the handler
+    discards it if the client never does.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    shm = shared_memory.SharedMemory(create=True, size=max(vectors.nbytes, 1))
+    try:
+        np.ndarray(vectors.shape, dtype=vectors.dtype, buffer=shm.buf)[...] = vectors
+    finally:
+        shm.close()
+    # A posse passa para o cliente: o resource tracker deste processo não o deve apagar
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return {"shm": shm.name, "shape": list(vectors.shape), "dtype": str(vectors.dtype)}
+
+
+def discard_shared(name: str | None) -> None:
+    """Unlink the block `name` unless the client already did."""
+    if name is None:
+        return
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+    logger.debug("Discarded unread shared memory block %s", name)
+
+
+def read_shared(header: Dict[str, Any]) -> np.ndarray:
+    """Copy the block described by `header` out of shared memory and unlink it."""
+    shm = shared_memory.SharedMemory(name=header["shm"])
+    try:
+        vectors = np.ndarray(tuple(header["shape"]), dtype=header["dtype"], buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+    return vectors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CVForge embedding server")
+    parser.add_argument(
+        "--socket", default=settings.embedding_server_socket or str(settings.data_dir / "embedding.sock"),
+        help="Unix socket path to listen on",
+    )
+    parser.add_argument("--model", default=settings.embedding_model, help="model to load at startup")
+    parser.add_argument("--backend", default=settings.embedding_backend, choices=("torch", "onnx"))
+    parser.add_argument("--max-batch", type=int, default=settings.micro_batch_max_size)
+    parser.add_argument("--max-wait-ms", type=float, default=settings.micro_batch_max_wait_ms)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    load_time = model_registry.warmup(args.model, args.backend)
+    logger.info("Model '%s' loaded in %.2fs", model_key(args.model, args.backend), load_time)
+
+    server = EmbeddingServer(Path(args.socket), args.max_batch, args.max_wait_ms / 1000)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    logger.info("Embedding server listening on %s (pid %d)", args.socket, os.getpid())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
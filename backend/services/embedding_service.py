@@ -1,48 +1,82 @@
-import faiss
+from __future__ import annotations
+
+import re
+
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from config import settings
+from services.micro_batcher import get_batcher
+from services.model_registry import model_key, model_registry
+from services.query_cache import query_cache
 
-class EmbeddingService(object):
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
-        self.dimension = self.model.get_sentence_embedding_dimension()
 
-    def encode(self, text: str) -> np.ndarray:
-        return self.model.encode(text)
+def project_text(project: dict) -> str:
+    """Text that represents a project in the embedding space: `[techs] description`."""
+    return f"[{', '.join(project['technologies'])}] {project['description']}"
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
 
-    def encode_batch(self, texts: list[str]) -> np.ndarray:
-        return self.model.encode(texts)
 
-    def build_index(self, projects: list[dict]) -> faiss.IndexFlatIP:
-        texts = [f"[{", ".join(p["technologies"])}] {p["description"]}" for p in projects]
-        embeddings = self.encode_batch(texts)
+def project_chunks(project: dict, max_chars: int = 400) -> list[str]:
+    """
+    Split a project into short texts that fit the model's token limit:
+    description sentences grouped up to `max_chars`, plus one chunk per
+    achievement. Every chunk is prefixed with `[techs]`.
+    """
+    prefix = f"[{', '.join(project['technologies'])}] "
 
-        # Normalizar embeddings para similaridade coseno
-        embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    chunks = []
+    current = ""
+    for sentence in _SENTENCE_END.split((project.get("description") or "").strip()):
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}".strip()
+    if current:
+        chunks.append(current)
 
-        index = faiss.IndexFlatIP(self.dimension)  # Inner Product = coseno após normalização
-        index.add(embeddings)
+    chunks.extend(a.strip() for a in project.get("achievements") or [] if a.strip())
 
-        # Guardar referência aos projetos
-        self.projects = projects
-        return index
+    return [prefix + chunk for chunk in chunks] or [project_text(project)]
 
-    def search(self, index: faiss.IndexFlatIP, job_description: str, top_n: int = 5):
-        query_vec = self.encode(job_description)
-        query_vec = query_vec / np.linalg.norm(query_vec)
 
-        query_vec = np.expand_dims(query_vec, axis=0)  # FAISS espera 2D
-        scores, indices = index.search(query_vec, top_n)
+def experience_text(experience: dict) -> str:
+    """Text that represents a work experience: `[techs] position at company. description achievements`."""
+    parts = [f"{experience['position']} at {experience['company']}."]
+    if experience.get("description"):
+        parts.append(experience["description"])
+    parts.extend(experience.get("achievements") or [])
+    return f"[{', '.join(experience.get('technologies') or [])}] {' '.join(parts)}"
 
-        results = []
-        for rank, idx in enumerate(indices[0]):
-            if idx == -1:
-                continue
-            project = self.projects[idx]
-            results.append({
-                "rank": rank + 1,
-                "score": float(scores[0][rank]),
-                "project": project
-            })
 
-        return results
+class EmbeddingService(object):
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+        # Modelo partilhado por todo o processo (carregado uma única vez),
+        # ou o do embedding server se estiver configurado
+        self.model_name = model_name
+        # Chave das caches: muda com o backend, porque os vetores também mudam
+        self.model_key = model_key(model_name)
+        if settings.embedding_server_socket:
+            from services.embedding_client import RemoteEmbeddingModel
+
+            self.model = RemoteEmbeddingModel(settings.embedding_server_socket, model_name)
+        else:
+            self.model = model_registry.get(model_name)
+        # Pedidos concorrentes de encode(text) juntam-se num só forward pass
+        self.batcher = get_batcher(self.model_key, self.model.encode) if settings.micro_batch_enabled else None
+        self.dimension = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, text: str) -> np.ndarray:
+        # Descrições de vagas repetem-se muito: evita o forward pass
+        cached = query_cache.get(self.model_key, text)
+        if cached is not None:
+            return cached
+        if self.batcher is not None:
+            vector = self.batcher.submit([text])[0]
+        else:
+            vector = self.model.encode(text)
+        return query_cache.put(self.model_key, text, vector)
+
+    def encode_batch(self, texts: list[str]) -> np.ndarray:
+        return self.model.encode(texts)
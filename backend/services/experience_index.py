@@ -0,0 +1,51 @@
+import logging
+import threading
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import func, select
+
+from config import settings, get_db
+from models import Experience
+from services.embedding_service import EmbeddingService, experience_text
+from services.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+class ExperienceIndex(VectorIndex):
+    name = "experiences"
+    kind = "experience"
+
+    def __init__(self, embedding_service: EmbeddingService, index_dir=None):
+        super().__init__(embedding_service, index_dir or settings.data_dir / "index")
+        self.db = get_db()
+
+    def item_text(self, item: Dict[str, Any]) -> str:
+        return experience_text(item)
+
+    def fetch_all(self) -> List[Dict[str, Any]]:
+        with self.db.begin() as session:
+            experiences = session.scalars(select(Experience)).all()
+        return [xp.as_dict() for xp in experiences]
+
+    def fetch_many(self, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        with self.db.begin() as session:
+            experiences = session.scalars(select(Experience).where(Experience.id.in_(ids))).all()
+        return [xp.as_dict() for xp in experiences]
+
+    def count_items(self) -> int:
+        with self.db.begin() as session:
+            return session.scalar(select(func.count(Experience.id)))
+
+
+_experience_index: ExperienceIndex | None = None
+_experience_index_lock = threading.Lock()
+
+
+def get_experience_index() -> ExperienceIndex:
+    """Return the process-wide experience index, creating it on first use."""
+    global _experience_index
+    with _experience_index_lock:
+        if _experience_index is None:
+            _experience_index = ExperienceIndex(EmbeddingService(settings.embedding_model))
+        return _experience_index
@@ -0,0 +1,49 @@
+import logging
+import numpy as np
+from repositories import ExperienceRepo
+from services.experience_index import get_experience_index
+
+logger = logging.getLogger(__name__)
+
+class ExperienceMatcherService(object):
+    def __init__(self):
+        self.repo = ExperienceRepo()
+        self.index = get_experience_index()
+        self.embedding_service = self.index.embedding_service
+
+    def match_experiences(
+        self,
+        job_description: str | None = None,
+        top_n: int = 3,
+        query_vec: np.ndarray | None = None
+    ):
+        """
+        Rank experiences against a job description. Pass `query_vec` to reuse an
+        embedding already computed for the same description (e.g. for projects).
+        """
+        if query_vec is None:
+            query_vec = self.embedding_service.encode(job_description)
+
+        return self.match_experiences_many(np.atleast_2d(query_vec), top_n=top_n)[0]
+
+    def match_experiences_many(self, query_vecs: np.ndarray, top_n: int = 3) -> list[list[dict]]:
+        """`match_experiences` for several embeddings at once (one search, one fetch)."""
+        hits_per_query = self.index.search_many(query_vecs, top_n=top_n)
+        hit_ids = list(dict.fromkeys(xid for hits in hits_per_query for xid, _ in hits))
+        experiences = {xp.id: xp.as_dict() for xp in self.repo.get_many(hit_ids)}
+
+        all_results = []
+        for hits in hits_per_query:
+            results = []
+            for xid, score in hits:
+                experience = experiences.get(xid)
+                if experience is None:
+                    continue
+                results.append({
+                    "rank": len(results) + 1,
+                    "score": score,
+                    "experience": experience
+                })
+            all_results.append(results)
+
+        return all_results
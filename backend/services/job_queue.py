@@ -0,0 +1,148 @@
+import datetime
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: str
+    status: JobStatus = JobStatus.QUEUED
+    created_at: datetime.datetime = field(default_factory=datetime.datetime.now)
+    started_at: Optional[datetime.datetime] = None
+    finished_at: Optional[datetime.datetime] = None
+    result: Any = None
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status.value,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue(object):
+    """
+    Bounded background worker pool with per-job status tracking.
+
+    At most `max_workers` jobs run at once and at most `max_pending` more wait
+    in the queue; `submit` raises `QueueFullError` beyond that, so callers can
+    push back instead of piling up work. Finished jobs are kept (up to
+    `max_finished`) so their status can still be polled.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, max_finished: int = 500):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+
+        self._executor: ThreadPoolExecutor | None = None
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="cv-job",
+            )
+        return self._executor
+
+    def _count(self, *statuses: JobStatus) -> int:
+        return sum(1 for job in self._jobs.values() if job.status in statuses)
+
+    def submit(self, fn: Callable[..., Any], *args, job_id: str | None = None, **kwargs) -> Job:
+        job = Job(id=job_id or str(uuid.uuid4()))
+
+        with self._lock:
+            if self._count(JobStatus.QUEUED) >= self.max_pending:
+                raise QueueFullError(
+                    f"Job queue is full ({self.max_pending} jobs waiting), try again later"
+                )
+            self._jobs[job.id] = job
+            self._prune()
+            future = self._get_executor().submit(self._run, job, fn, args, kwargs)
+            future.add_done_callback(lambda f: self._on_done(job, f))
+
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., Any], args, kwargs) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.datetime.now()
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = JobStatus.DONE
+        except Exception as e:
+            logger.exception("Job %s failed", job.id)
+            job.error = str(e)
+            job.status = JobStatus.FAILED
+        finally:
+            job.finished_at = datetime.datetime.now()
+
+    def _on_done(self, job: Job, future: Future) -> None:
+        # Cancelado no shutdown antes de começar: quem faz polling tem de ver o fim
+        if future.cancelled():
+            job.error = "Cancelled: the server shut down before the job started"
+            job.status = JobStatus.FAILED
+            job.finished_at = datetime.datetime.now()
+
+    def _prune(self) -> None:
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in (JobStatus.DONE, JobStatus.FAILED)
+        ]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            self._jobs.pop(job_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "queued": self._count(JobStatus.QUEUED),
+                "running": self._count(JobStatus.RUNNING),
+            }
+
+    def shutdown(self, wait: bool = True) -> list[Job]:
+        """Stop the workers; jobs that never started are marked as failed and returned."""
+        if self._executor is None:
+            return []
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._executor = None
+        with self._lock:
+            return [
+                job for job in self._jobs.values()
+                if job.status is JobStatus.FAILED and job.started_at is None
+            ]
+
+
+# Singleton instance
+generation_queue = JobQueue(settings.generation_workers, settings.generation_queue_size)
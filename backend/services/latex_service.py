@@ -1,6 +1,9 @@
 from __future__ import annotations
 import datetime
 import logging
+import re
+import threading
+import uuid
 from pathlib import Path
 from string import Template
 from typing import Dict, Any, List
@@ -12,6 +15,29 @@ class TemplateNotFoundError(FileNotFoundError):
     pass
 
 
+# Single-pass escaping: one regex scan with a lookup per special character.
+# The table reproduces the output of the previous chain of str.replace calls
+# exactly, including the braces after \textbackslash being escaped (the
+# backslash was replaced before "{" and "}"). See benchmarks/bench_escape_latex.py.
+_LATEX_ESCAPES = {
+    "\\": r"\textbackslash\{\}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\^{}",
+}
+_LATEX_SPECIALS = re.compile("[" + re.escape("".join(_LATEX_ESCAPES)) + "]")
+
+
+def _escape_match(match: re.Match) -> str:
+    return _LATEX_ESCAPES[match[0]]
+
+
 def escape_latex(text: str) -> str:
     """
     Basic LaTeX escape for common special characters.
@@ -20,25 +46,14 @@ def escape_latex(text: str) -> str:
     """
     if text is None:
         return ""
-    
-    replacements = {
-        "\\": r"\textbackslash{}",
-        "&": r"\&",
-        "%": r"\%",
-        "$": r"\$",
-        "#": r"\#",
-        "_": r"\_",
-        "{": r"\{",
-        "}": r"\}",
-        "~": r"\textasciitilde{}",
-        "^": r"\^{}",
-    }
-
-    s = str(text)
-    for k, v in replacements.items():
-        s = s.replace(k, v)
-        
-    return s
+
+    return _LATEX_SPECIALS.sub(_escape_match, str(text))
+
+
+# Templates já lidos, partilhados por todas as instâncias:
+# path -> (mtime_ns, size, Template)
+_TEMPLATE_CACHE: Dict[Path, tuple[int, int, Template]] = {}
+_TEMPLATE_CACHE_LOCK = threading.Lock()
 
 
 class LaTeXService:
@@ -58,13 +73,40 @@ class LaTeXService:
             raise TemplateNotFoundError(f"Template '{template_name}' not found at {template_path}")
         return template_path.read_text(encoding="utf-8")
 
+    def get_template(self, template_name: str) -> Template:
+        """
+        Parsed template, cached in-process. The file is only re-read when its
+        mtime or size changes.
+        """
+        template_path = (self.template_dir / f"{template_name}.tex").absolute()
+        try:
+            stat = template_path.stat()
+        except FileNotFoundError:
+            raise TemplateNotFoundError(f"Template '{template_name}' not found at {template_path}")
+
+        cached = _TEMPLATE_CACHE.get(template_path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        template = Template(self.load_template(template_name))
+        with _TEMPLATE_CACHE_LOCK:
+            _TEMPLATE_CACHE[template_path] = (stat.st_mtime_ns, stat.st_size, template)
+        return template
+
+    def warm_templates(self) -> List[str]:
+        """Parse every available template ahead of the first render."""
+        names = self.get_available_templates()
+        for name in names:
+            self.get_template(name)
+        return names
+
     def render(self, template_name: str, context: Dict[str, Any]) -> str:
         """
         Render template using string.Template with very basic escaping.
         For lists (e.g. projects) caller should pre-render to a single string,
         or extend this function to accept richer structures.
         """
-        template_str = self.load_template(template_name)
+        template = self.get_template(template_name)
         # # escape values conservatively
         # escaped_context = {
         #     k: (v if isinstance(v, str) and v.startswith(r"\latexraw:") else escape_latex(v))
@@ -85,13 +127,23 @@ class LaTeXService:
             'projects': context.get('projects')
         }
 
-        template = Template(template_str)
-        return template.safe_substitute(context)
+        # Secções opcionais: safe_substitute deixaria "$experiences" literal, o que
+        # abre modo matemático e parte a compilação (pipeline.py, preview de templates)
+        return template.safe_substitute({"experiences": "", **context})
 
     def save_rendered(self, template_name: str, context: Dict[str, Any]) -> Path:
         rendered_tex = self.render(template_name, context)
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = self.output_dir / f"cv_{timestamp}.tex"
-        output_path.write_text(rendered_tex, encoding="utf-8")
+
+        # Sufixo aleatório + criação exclusiva: gerações no mesmo segundo não se sobrepõem
+        while True:
+            output_path = self.output_dir / f"cv_{timestamp}_{uuid.uuid4().hex[:12]}.tex"
+            try:
+                with open(output_path, "x", encoding="utf-8") as f:
+                    f.write(rendered_tex)
+                break
+            except FileExistsError:
+                continue
+
         logger.info("Rendered LaTeX saved to %s", output_path)
         return output_path
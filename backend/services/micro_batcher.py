@@ -0,0 +1,148 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _Request(object):
+    __slots__ = ("texts", "vectors", "error", "done")
+
+    def __init__(self, texts: Sequence[str]):
+        self.texts = texts
+        self.vectors: np.ndarray | None = None
+        self.error: Exception | None = None
+        self.done = threading.Event()
+
+
+class MicroBatcher(object):
+    """
+    Coalesces concurrent encode calls into one batched forward pass.
+
+    The first request of a batch waits at most `max_wait_seconds` for others
+    to join, or until `max_batch_size` texts are queued; a single collector
+    thread then runs `encode_fn` on all of them and hands each caller back its
+    own rows. Achieved batch sizes are tracked for `stats`.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_batch_size: int,
+        max_wait_seconds: float,
+        name: str = "batcher",
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+        self.name = name
+
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.max_seen_batch = 0
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name=f"micro-batch-{self.name}", daemon=True)
+                self._thread.start()
+
+    def submit(self, texts: Sequence[str]) -> np.ndarray:
+        """Encode `texts` as part of whatever batch is being gathered; blocks until done."""
+        if not texts:
+            return self.encode_fn([])
+        self._ensure_thread()
+        request = _Request(list(texts))
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.vectors
+
+    def _gather(self) -> List[_Request]:
+        pending = [self._queue.get()]
+        size = len(pending[0].texts)
+        deadline = time.monotonic() + self.max_wait_seconds
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                # Já há trabalho à espera? Junta-o mesmo depois do prazo
+                request = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            pending.append(request)
+            size += len(request.texts)
+        return pending
+
+    def _loop(self) -> None:
+        while True:
+            pending = self._gather()
+            texts = [text for request in pending for text in request.texts]
+
+            try:
+                vectors = np.asarray(self.encode_fn(texts), dtype=np.float32)
+            except Exception as e:
+                logger.exception("Batch of %d texts failed", len(texts))
+                for request in pending:
+                    request.error = e
+                    request.done.set()
+                continue
+
+            with self._lock:
+                self.requests += len(pending)
+                self.texts += len(texts)
+                self.batches += 1
+                self.max_seen_batch = max(self.max_seen_batch, len(texts))
+
+            offset = 0
+            for request in pending:
+                request.vectors = vectors[offset:offset + len(request.texts)]
+                offset += len(request.texts)
+                request.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+                "batches": self.batches,
+                "requests": self.requests,
+                "texts": self.texts,
+                "mean_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+                "mean_requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "largest_batch": self.max_seen_batch,
+            }
+
+
+_batchers: Dict[str, MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(key: str, encode_fn: Callable[[List[str]], np.ndarray]) -> MicroBatcher:
+    """Process-wide batcher for `key` (usually the model name), created on first use."""
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = _batchers[key] = MicroBatcher(
+                encode_fn,
+                max_batch_size=settings.micro_batch_max_size,
+                max_wait_seconds=settings.micro_batch_max_wait_ms / 1000,
+                name=key,
+            )
+        return batcher
+
+
+def batcher_stats() -> Dict[str, Any]:
+    with _batchers_lock:
+        return {key: batcher.stats() for key, batcher in _batchers.items()}
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict
+
+from config import settings
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "onnx")
+
+
+def model_key(model_name: str, backend: str | None = None, quantize: bool | None = None) -> str:
+    """
+    Identity of a loaded model, used for the registry and for every embedding
+    cache. The PyTorch backend keeps the bare model name, so existing caches
+    stay valid; other backends produce (slightly) different vectors and get
+    their own key, e.g. `name@onnx` or `name@onnx-qint8`.
+    """
+    backend = backend or settings.embedding_backend
+    quantize = settings.embedding_quantize if quantize is None else quantize
+    if backend == "torch":
+        return model_name
+    return f"{model_name}@{backend}-qint8" if quantize else f"{model_name}@{backend}"
+
+
+class ModelRegistry(object):
+    """
+    Process-wide registry of loaded SentenceTransformer models.
+
+    Each model is loaded once per process (lazily on first use, or eagerly via
+    `warmup`) and then shared by every request. Loading is guarded by a per-model
+    lock so concurrent first requests don't load the same model twice.
+
+    The inference backend comes from `settings.embedding_backend`: "torch" or
+    "onnx" (ONNX Runtime, optionally with int8 dynamic quantization).
+    """
+
+    def __init__(self):
+        self._models: Dict[str, SentenceTransformer] = {}
+        self._load_times: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._registry_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, model_name: str, backend: str | None = None, quantize: bool | None = None) -> SentenceTransformer:
+        backend = backend or settings.embedding_backend
+        quantize = settings.embedding_quantize if quantize is None else quantize
+        key = model_key(model_name, backend, quantize)
+
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock_for(key):
+            # Outro thread pode ter carregado enquanto esperávamos
+            model = self._models.get(key)
+            if model is not None:
+                return model
+
+            start = time.perf_counter()
+            model = self._load(model_name, backend, quantize)
+            elapsed = time.perf_counter() - start
+
+            self._models[key] = model
+            self._load_times[key] = elapsed
+            logger.info("Loaded embedding model '%s' in %.2fs", key, elapsed)
+
+        return model
+
+    def _load(self, model_name: str, backend: str, quantize: bool) -> SentenceTransformer:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend '{backend}' (expected one of {', '.join(BACKENDS)})")
+
+        # Import tardio: torch só é carregado quando um modelo é mesmo preciso
+        from sentence_transformers import SentenceTransformer
+
+        if backend == "torch":
+            return SentenceTransformer(model_name)
+        if not quantize:
+            return SentenceTransformer(model_name, backend="onnx")
+        return self._load_quantized_onnx(model_name)
+
+    def _load_quantized_onnx(self, model_name: str) -> SentenceTransformer:
+        """
+        Export the model to ONNX, quantize it to int8 (dynamic quantization) and
+        load the result. Both steps run once; the files are kept under
+        `<data_dir>/onnx/<model>/`.
+        """
+        from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+        config = settings.embedding_quantization_config
+        local_dir = settings.data_dir / "onnx" / re.sub(r"[^\w.-]", "_", model_name)
+        quantized_file = Path("onnx") / f"model_qint8_{config}.onnx"
+
+        if not (local_dir / quantized_file).exists():
+            logger.info("Exporting '%s' to int8 ONNX (%s) in %s", model_name, config, local_dir)
+            model = SentenceTransformer(model_name, backend="onnx")
+            model.save_pretrained(str(local_dir))
+            export_dynamic_quantized_onnx_model(model, config, str(local_dir))
+
+        return SentenceTransformer(
+            str(local_dir), backend="onnx", model_kwargs={"file_name": quantized_file.as_posix()}
+        )
+
+    def warmup(self, model_name: str, backend: str | None = None, quantize: bool | None = None) -> float:
+        """Load `model_name` if needed and return its load time in seconds."""
+        self.get(model_name, backend, quantize)
+        return self._load_times[model_key(model_name, backend, quantize)]
+
+    def is_loaded(self, model_name: str, backend: str | None = None, quantize: bool | None = None) -> bool:
+        return model_key(model_name, backend, quantize) in self._models
+
+    def load_time(self, model_name: str, backend: str | None = None, quantize: bool | None = None) -> float | None:
+        return self._load_times.get(model_key(model_name, backend, quantize))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {"load_time_seconds": round(self._load_times[name], 3)}
+            for name in self._models
+        }
+
+
+# Singleton instance
+model_registry = ModelRegistry()
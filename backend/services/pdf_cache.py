@@ -0,0 +1,147 @@
+import functools
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def compiler_version(compiler: str = "pdflatex") -> str:
+    """First line of `<compiler> --version`, or "unknown" if it can't be run."""
+    try:
+        completed = subprocess.run(
+            [compiler, "--version"], capture_output=True, text=True, timeout=10
+        )
+        return completed.stdout.splitlines()[0].strip() if completed.stdout else "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    """Place `src` at `dst` atomically, hard-linking when the filesystem allows it."""
+    tmp_path = dst.with_name(f".{dst.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        shutil.copy2(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+class PDFCache(object):
+    """
+    Content-addressed cache of compiled PDFs.
+
+    Entries are keyed by a hash of the rendered TeX source, the template name and
+    the compiler version, so byte-identical documents are compiled only once.
+    Entries older than `max_age_seconds` are dropped, and the least recently
+    used ones are dropped while the cache is larger than `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int, max_age_seconds: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(tex_source: str, template: str | None, compiler: str = "pdflatex") -> str:
+        digest = hashlib.sha256()
+        for part in (compiler_version(compiler), template or "", tex_source):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pdf"
+
+    def _record(self, hit: bool) -> None:
+        # Pedidos concorrentes: sem o lock, incrementos perdem-se
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> Optional[Path]:
+        path = self._path(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._record(hit=False)
+            return None
+
+        if time.time() - stat.st_mtime > self.max_age_seconds:
+            path.unlink(missing_ok=True)
+            self._record(hit=False)
+            return None
+
+        # mtime serve de "último acesso" para o LRU
+        os.utime(path)
+        self._record(hit=True)
+        return path
+
+    def put(self, key: str, pdf_path: Path) -> Path:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".tmp", delete=False) as tmp_file:
+            tmp_path = Path(tmp_file.name)
+        shutil.copy2(pdf_path, tmp_path)
+        os.replace(tmp_path, self._path(key))
+        os.utime(self._path(key))
+
+        self.evict()
+        return self._path(key)
+
+    def evict(self) -> None:
+        with self._lock:
+            now = time.time()
+            entries = []
+            for path in self.cache_dir.glob("*.pdf"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if now - stat.st_mtime > self.max_age_seconds:
+                    path.unlink(missing_ok=True)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                logger.debug("Evicted cached PDF %s", path.name)
+
+    def stats(self) -> Dict[str, Any]:
+        entries = list(self.cache_dir.glob("*.pdf")) if self.cache_dir.exists() else []
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "entries": len(entries),
+            "bytes": sum(p.stat().st_size for p in entries if p.exists()),
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+        }
+
+
+# Singleton instance
+pdf_cache = PDFCache(
+    settings.generated_dir / "cache",
+    max_bytes=settings.pdf_cache_max_bytes,
+    max_age_seconds=settings.pdf_cache_max_age_seconds,
+)
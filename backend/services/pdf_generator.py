@@ -1,46 +1,102 @@
+from dataclasses import dataclass
 from pathlib import Path
 import logging
-from pdflatex import PDFLaTeX
+import os
+import shutil
+import tempfile
+from config import settings
+from services.compile_executor import CompileExecutor, compile_executor
+from services.pdf_cache import PDFCache, link_or_copy, pdf_cache
 
 logger = logging.getLogger(__name__)
 
+# Default de `cache`: a cache global (se ativa). `None` explícito desliga a cache.
+_DEFAULT = object()
+
+
+@dataclass
+class PDFBuild:
+    pdf_path: Path
+    passes: int  # engine runs (0 when served from the cache)
+    cached: bool = False
+
 
 class PDFGeneratorService:
-    def __init__(self, output_dir: Path):
+    def __init__(
+        self,
+        output_dir: Path,
+        cache: PDFCache | None | object = _DEFAULT,
+        executor: CompileExecutor | None = None,
+    ):
         self.output_dir = Path(output_dir).absolute()
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        if cache is _DEFAULT:
+            cache = pdf_cache if settings.pdf_cache_enabled else None
+        self.cache = cache
+        self.executor = executor or compile_executor
 
-    def generate(self, tex_path: Path) -> Path:
+    def generate(self, tex_path: Path, template: str | None = None) -> Path:
         """Compile tex_path into a PDF and return the PDF path."""
+        return self.build(tex_path, template).pdf_path
+
+    def build(self, tex_path: Path, template: str | None = None) -> PDFBuild:
+        """
+        Compile tex_path into a PDF, rerunning the engine only while the log asks
+        for it (up to `settings.latex_max_passes`).
+
+        Identical TeX (same template and compiler) is served from the PDF cache
+        without running the TeX engine.
+        """
         tex_path = Path(tex_path).absolute()
         if not tex_path.exists():
             raise FileNotFoundError(f"TeX file not found: {tex_path}")
 
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(
+                tex_path.read_text(encoding="utf-8"), template, self.executor.engine
+            )
+            cached_pdf = self.cache.get(cache_key)
+            if cached_pdf is not None:
+                pdf_path = self.output_dir / tex_path.with_suffix(".pdf").name
+                link_or_copy(cached_pdf, pdf_path)
+                logger.info("PDF cache hit for %s", tex_path.name)
+                return PDFBuild(pdf_path, passes=0, cached=True)
+
+        # Cada compilação tem a sua pasta: .aux/.log/.pdf de jobs paralelos não colidem
+        build_dir = Path(tempfile.mkdtemp(prefix=f".build_{tex_path.stem}_", dir=self.output_dir))
         try:
-            pdf_path = self._compile_pdf(tex_path)
-            self._clean_temp_files(tex_path)
-            return pdf_path
+            built_pdf, passes = self._compile_pdf(tex_path, build_dir)
+            pdf_path = self._promote(built_pdf)
+            if cache_key is not None:
+                self.cache.put(cache_key, pdf_path)
+            return PDFBuild(pdf_path, passes=passes)
         except Exception as exc:
             logger.exception("PDF generation failed for %s", tex_path)
             raise
+        finally:
+            self._clean_temp_files(build_dir)
+
+    def _compile_pdf(self, tex_path: Path, build_dir: Path) -> tuple[Path, int]:
+        # Timeout, limite de memória e kill ficam a cargo do executor
+        max_passes = max(1, settings.latex_max_passes)
+        for passes in range(1, max_passes + 1):
+            result = self.executor.compile(tex_path, build_dir)
+            if not result.needs_rerun:
+                break
+            if passes == max_passes:
+                logger.warning("%s still asks for a rerun after %d passes", tex_path.name, passes)
+        return result.pdf_path, passes
+
+    def _promote(self, built_pdf: Path) -> Path:
+        """Atomically move a finished PDF from its build dir into output_dir."""
+        pdf_path = self.output_dir / built_pdf.name
+        os.replace(built_pdf, pdf_path)
+        return pdf_path
+
+    def _clean_temp_files(self, build_dir: Path) -> None:
+        try:
+            shutil.rmtree(build_dir)
+        except Exception:
+            logger.warning("Could not remove build dir %s", build_dir)
 
-    def _compile_pdf(self, tex_path: Path) -> Path:
-        pdf_latex = PDFLaTeX.from_texfile(str(tex_path))
-        pdf_latex.set_output_directory(str(self.output_dir))
-        pdf, log, completed_process = pdf_latex.create_pdf(keep_pdf_file=True)
-
-        if hasattr(completed_process, "returncode") and completed_process.returncode != 0:
-            stderr = getattr(completed_process, "stderr", "<no stderr>")
-            raise RuntimeError(f"LaTeX compilation failed (returncode={completed_process.returncode}). Stderr: {stderr!s}")
-
-        pdf_filename = tex_path.with_suffix(".pdf").name
-        return self.output_dir / pdf_filename
-
-    def _clean_temp_files(self, tex_path: Path) -> None:
-        for ext in [".aux", ".log", ".out", ".toc"]:
-            tmp_file = self.output_dir / f"{tex_path.stem}{ext}"
-            try:
-                if tmp_file.exists():
-                    tmp_file.unlink()
-            except Exception:
-                logger.warning("Could not remove temp file %s", tmp_file)
@@ -0,0 +1,57 @@
+import logging
+import threading
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import func, select
+
+from config import settings, get_db
+from models import Project
+from services.embedding_service import EmbeddingService, project_chunks, project_text
+from services.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectIndex(VectorIndex):
+    name = "projects"
+    kind = "project"
+
+    def __init__(self, embedding_service: EmbeddingService, index_dir=None):
+        super().__init__(embedding_service, index_dir or settings.data_dir / "index")
+        self.db = get_db()
+        self.chunked = settings.embedding_chunking
+
+    def item_text(self, item: Dict[str, Any]) -> str:
+        return project_text(item)
+
+    def item_chunks(self, item: Dict[str, Any]) -> List[str]:
+        if not self.chunked:
+            return [project_text(item)]
+        return project_chunks(item, settings.chunk_max_chars)
+
+    def fetch_all(self) -> List[Dict[str, Any]]:
+        with self.db.begin() as session:
+            projects = session.scalars(select(Project)).all()
+        return [p.as_dict() for p in projects]
+
+    def fetch_many(self, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        with self.db.begin() as session:
+            projects = session.scalars(select(Project).where(Project.id.in_(ids))).all()
+        return [p.as_dict() for p in projects]
+
+    def count_items(self) -> int:
+        with self.db.begin() as session:
+            return session.scalar(select(func.count(Project.id)))
+
+
+_project_index: ProjectIndex | None = None
+_project_index_lock = threading.Lock()
+
+
+def get_project_index() -> ProjectIndex:
+    """Return the process-wide project index, creating it on first use."""
+    global _project_index
+    with _project_index_lock:
+        if _project_index is None:
+            _project_index = ProjectIndex(EmbeddingService(settings.embedding_model))
+        return _project_index
@@ -1,32 +1,43 @@
 import logging
-from typing import List
-from sqlalchemy import select
-from config import settings, get_db
-from models import Project
-from services import EmbeddingService
+import numpy as np
+from repositories import ProjectRepo
+from services.project_index import get_project_index
 
 logger = logging.getLogger(__name__)
 
 class ProjectMatcherService(object):
     def __init__(self):
-        self.db = get_db()
-        self.embedding_service = EmbeddingService(settings.embedding_model)
-        pass
+        self.repo = ProjectRepo()
+        self.index = get_project_index()
+        self.embedding_service = self.index.embedding_service
 
-    def _get_all_projects(self):
-        with self.db.begin() as session:
-            stmt = select(Project)
-            projects = session.scalars(stmt).all()
-            
-        return projects
+    def match_projects(self, job_description: str | None = None, top_n: int = 5, query_vec: np.ndarray | None = None):
+        # Um encode da query + uma pesquisa no índice persistente
+        if query_vec is None:
+            query_vec = self.embedding_service.encode(job_description)
+        return self.match_projects_many(np.atleast_2d(query_vec), top_n=top_n)[0]
 
-    def match_projects(self, job_description: str, top_n: int = 5):
-        projects = self._get_all_projects()
-        if not projects:
-            return []
+    def match_projects_many(self, query_vecs: np.ndarray, top_n: int = 5) -> list[list[dict]]:
+        """
+        Rank projects for several job descriptions (one embedding per row) with
+        a single index search and a single query to hydrate the hits.
+        """
+        hits_per_query = self.index.search_many(query_vecs, top_n=top_n)
+        hit_ids = list(dict.fromkeys(pid for hits in hits_per_query for pid, _ in hits))
+        projects = {p.id: p.as_dict() for p in self.repo.get_many(hit_ids)}
 
-        projects_dict = [p.as_dict() for p in projects]
+        all_results = []
+        for hits in hits_per_query:
+            results = []
+            for pid, score in hits:
+                project = projects.get(pid)
+                if project is None:
+                    continue
+                results.append({
+                    "rank": len(results) + 1,
+                    "score": score,
+                    "project": project
+                })
+            all_results.append(results)
 
-        index = self.embedding_service.build_index(projects_dict)
-        results = self.embedding_service.search(index, job_description, top_n=top_n)
-        return results
+        return all_results
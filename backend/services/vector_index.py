@@ -0,0 +1,665 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence
+
+import numpy as np
+
+from config import settings
+from repositories import EmbeddingRepo, IndexChangeRepo
+from services.embedding_service import EmbeddingService
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem locks entre processos
+    fcntl = None
+
+if TYPE_CHECKING:
+    import faiss
+
+logger = logging.getLogger(__name__)
+
+# Chunk labels: item_id * CHUNK_STRIDE + chunk number (max chunks per item)
+CHUNK_STRIDE = 1024
+# Indexes that can't remove vectors (HNSW) re-add an edited item under a new
+# generation, kept in the label's high bits; its old labels become tombstones
+GENERATION_SHIFT = 40
+LABEL_MASK = (1 << GENERATION_SHIFT) - 1
+# Queued changes read per round-trip by `sync`
+SYNC_PAGE_SIZE = 1000
+
+
+def min_train_size(factory: str) -> int:
+    """
+    Vectors needed to train a faiss factory string reasonably: ~39 per IVF
+    centroid and 256 for a PQ codebook (8 bits). 0 means no training needed.
+    """
+    size = 0
+    ivf = re.search(r"IVF(\d+)", factory)
+    if ivf:
+        size = 39 * int(ivf.group(1))
+    if re.search(r"PQ\d+", factory):
+        size = max(size, 256)
+    return size
+
+
+def _ivf(index: faiss.Index) -> faiss.IndexIVF | None:
+    import faiss
+
+    try:
+        return faiss.extract_index_ivf(index)
+    except RuntimeError:
+        return None
+
+
+def new_faiss_index(dimension: int, factory: str, train_vectors: np.ndarray | None = None) -> faiss.Index:
+    """
+    Inner-product index from a faiss factory string (`HNSW32`, `IVF1024,PQ32`...),
+    trained if needed. IVF indexes store ids themselves (and `remove_ids` on an
+    IDMap over them breaks the mapping); anything else gets an IndexIDMap2.
+    """
+    import faiss
+
+    index = faiss.index_factory(dimension, factory, faiss.METRIC_INNER_PRODUCT)
+    if _ivf(index) is None:
+        index = faiss.IndexIDMap2(index)
+    if not index.is_trained:
+        if train_vectors is None or not len(train_vectors):
+            raise ValueError(f"Index '{factory}' needs training vectors")
+        index.train(np.ascontiguousarray(train_vectors, dtype=np.float32))
+    return index
+
+
+def index_labels(index: faiss.Index) -> np.ndarray:
+    """Every label stored in `index`, from its id map or its inverted lists."""
+    import faiss
+
+    ivf = _ivf(index)
+    if ivf is None:
+        return faiss.vector_to_array(index.id_map)
+    lists = ivf.invlists
+    return np.concatenate([np.zeros(0, dtype=np.int64)] + [
+        faiss.rev_swig_ptr(lists.get_ids(i), lists.list_size(i)).copy()
+        for i in range(ivf.nlist)
+        if lists.list_size(i)
+    ])
+
+
+def tune_index(index: faiss.Index, ef_search: int, nprobe: int) -> None:
+    """Apply the search-time knobs that exist for this index type (HNSW efSearch, IVF nprobe)."""
+    import faiss
+
+    params = faiss.ParameterSpace()
+    for name, value in (("efSearch", ef_search), ("nprobe", nprobe)):
+        try:
+            params.set_index_parameter(index, name, value)
+        except RuntimeError:
+            pass  # parâmetro não se aplica a este tipo de índice
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so inner product equals cosine similarity."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(vectors / norms)
+
+
+class VectorIndex(object):
+    """
+    Persistent FAISS index of normalized embeddings keyed by database id.
+
+    The index lives at `<index_dir>/<name>.faiss` (plus a small JSON sidecar with
+    the model name, dimension and change cursor). Writes to the table don't touch
+    it: repositories queue the changed ids in `index_changes`, in the same
+    transaction, and every process applies the changes past its cursor before
+    searching (`sync`). The snapshot is loaded and saved under a file lock; after
+    incremental changes it is rewritten at most every `index_save_interval_seconds`
+    (and at exit), since the change log can replay anything it misses. It is rebuilt from scratch only when it is missing, was built with another
+    model, is older than the change log retention or no longer matches the
+    number of rows in the DB.
+
+    Item vectors are cached in the `embeddings` table, keyed by model name and a
+    hash of the encoded text, so rebuilds only encode items whose text changed.
+
+    In chunked mode every item is split into several texts (`item_chunks`), each
+    chunk gets its own float16 vector labelled `item_id * CHUNK_STRIDE + n`, and
+    an item is scored by max or top-k mean similarity over its chunks.
+
+    `settings.index_factory` selects the faiss structure: exact `Flat` (default)
+    or an approximate one such as `HNSW32` or `IVF1024,PQ32`. Indexes that need
+    training are trained on the vectors at rebuild time, falling back to Flat
+    while the catalog is too small. Indexes that can't remove vectors (HNSW)
+    keep the old vectors of edited or deleted items as tombstones, excluded at
+    search time. Both are resolved by a background rebuild (`_maybe_compact`).
+
+    Subclasses define how rows are fetched (`fetch_all`, `fetch_many`) and turned into text.
+    """
+
+    name: str = "items"
+    kind: str = "item"
+    chunked: bool = False
+
+    def __init__(self, embedding_service: EmbeddingService, index_dir: Path):
+        self.embedding_service = embedding_service
+        self.embedding_repo = EmbeddingRepo()
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.index_dir / f"{self.name}.faiss"
+        self.meta_path = self.index_dir / f"{self.name}.json"
+        self.lock_path = self.index_dir / f"{self.name}.lock"
+        self.changes = IndexChangeRepo()
+
+        self._lock = threading.RLock()
+        self._index: faiss.Index | None = None
+        self._cursor = 0  # última alteração de index_changes aplicada
+        self._synced_at = 0.0
+        self._dirty = False  # alterações aplicadas que ainda não estão no snapshot
+        self._saved_at = 0.0
+        self._fallback = False  # Flat em vez de settings.index_factory (poucos vetores para treinar)
+        self._tombstones: set[int] = set()  # labels de vetores que o índice não consegue remover
+        self._generation = 0
+        self._search_params: tuple | None = None
+        self._compaction: object | None = None  # token da reconstrução em segundo plano em curso
+        atexit.register(self.flush)
+
+    # --- Hooks ---
+
+    def item_text(self, item: Dict[str, Any]) -> str:
+        raise NotImplementedError
+
+    def item_chunks(self, item: Dict[str, Any]) -> List[str]:
+        return [self.item_text(item)]
+
+    def fetch_all(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def fetch_many(self, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """Rows of `ids` that still exist."""
+        raise NotImplementedError
+
+    def count_items(self) -> int:
+        raise NotImplementedError
+
+    # --- Persistence ---
+
+    @property
+    def cache_kind(self) -> str:
+        return f"{self.kind}:chunks" if self.chunked else self.kind
+
+    @property
+    def vector_dtype(self) -> np.dtype:
+        return np.dtype(np.float16 if self.chunked else np.float32)
+
+    def _meta(self) -> Dict[str, Any]:
+        return {
+            "model": self.embedding_service.model_key,
+            "dimension": self.embedding_service.dimension,
+            "chunked": self.chunked,
+            "factory": settings.index_factory,
+        }
+
+    @property
+    def min_train_size(self) -> int:
+        return settings.index_min_train_size or min_train_size(settings.index_factory)
+
+    def _new_index(self, train_vectors: np.ndarray | None = None) -> tuple[faiss.Index, bool]:
+        """Empty index for `settings.index_factory`, and whether it fell back to Flat."""
+        import faiss
+
+        dimension = self.embedding_service.dimension
+        factory = settings.index_factory
+        fallback = False
+        if factory != "Flat":
+            n_train = 0 if train_vectors is None else len(train_vectors)
+            if n_train >= self.min_train_size:
+                try:
+                    index = new_faiss_index(dimension, factory, train_vectors)
+                    tune_index(index, settings.index_ef_search, settings.index_nprobe)
+                    return index, False
+                except (RuntimeError, ValueError) as e:
+                    # Não é retentado ao recarregar: corrigir INDEX_FACTORY e reconstruir
+                    logger.warning("Could not build '%s' index for '%s', using Flat: %s", factory, self.name, e)
+            else:
+                logger.info(
+                    "Index '%s': %d vectors are too few to train %s (need %d), using Flat",
+                    self.name, n_train, factory, self.min_train_size,
+                )
+                fallback = True
+
+        if self.chunked:
+            # float16: metade da memória por vetor, há vários vetores por item
+            return faiss.IndexIDMap2(faiss.IndexScalarQuantizer(
+                dimension, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+            )), fallback
+        # Inner Product = coseno após normalização
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(dimension)), fallback
+
+    def _labels(self, item_id: int, n_chunks: int, generation: int = 0) -> np.ndarray:
+        base = generation << GENERATION_SHIFT
+        if not self.chunked:
+            return np.array([base | item_id], dtype=np.int64)
+        return base | (item_id * CHUNK_STRIDE + np.arange(n_chunks, dtype=np.int64))
+
+    def _item_ids(self, labels: np.ndarray) -> np.ndarray:
+        labels = labels & LABEL_MASK
+        return labels // CHUNK_STRIDE if self.chunked else labels
+
+    def _live_labels(self, index: faiss.Index) -> np.ndarray:
+        labels = index_labels(index)
+        if self._tombstones:
+            labels = labels[~np.isin(labels, np.fromiter(self._tombstones, dtype=np.int64))]
+        return labels
+
+    def _live_count(self, index: faiss.Index) -> int:
+        """Vectors in `index` that searches can return."""
+        return index.ntotal - len(self._tombstones)
+
+    def _indexed_item_count(self, index: faiss.Index) -> int:
+        if not self.chunked and not self._tombstones:
+            return index.ntotal
+        return len(np.unique(self._item_ids(self._live_labels(index))))
+
+    def _install(self, index: faiss.Index, fallback: bool) -> None:
+        self._index = index
+        self._fallback = fallback
+        self._tombstones = set()
+        self._generation = 0
+        self._search_params = None
+
+    @contextmanager
+    def _file_lock(self, shared: bool = False):
+        """Serialize snapshot reads and writes across worker processes."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @property
+    def max_lag_seconds(self) -> float:
+        """How far behind the change log an index may fall before it must be rebuilt."""
+        # Metade da retenção: margem para relógios diferentes entre workers e base de dados
+        return settings.index_change_retention_hours * 3600 / 2
+
+    def _read_meta(self) -> Dict[str, Any] | None:
+        try:
+            return json.loads(self.meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _save(self) -> None:
+        import faiss
+
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        with self._file_lock():
+            disk = self._read_meta()
+            expected = self._meta()
+            if (
+                disk is not None
+                and disk.get("cursor", 0) > self._cursor
+                and {key: disk.get(key) for key in expected} == expected
+            ):
+                return  # outro worker já guardou um snapshot mais recente
+
+            tmp_path = self.path.with_suffix(".faiss.tmp")
+            faiss.write_index(self._index, str(tmp_path))
+            os.replace(tmp_path, self.path)
+            meta = {
+                **expected,
+                "cursor": self._cursor,
+                "synced_at": self._synced_at,
+                "fallback": self._fallback,
+                "generation": self._generation,
+                "tombstones": sorted(self._tombstones),
+            }
+            tmp_meta = self.meta_path.with_suffix(".json.tmp")
+            tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+            os.replace(tmp_meta, self.meta_path)
+
+        retention = timedelta(hours=settings.index_change_retention_hours)
+        self.changes.prune(self.kind, self._cursor, retention)
+
+    def _read(self) -> faiss.Index | None:
+        import faiss
+
+        with self._file_lock(shared=True):
+            if not self.path.exists():
+                return None
+            meta = self._read_meta()
+            if meta is None:
+                return None
+            expected = self._meta()
+            if {key: meta.get(key) for key in expected} != expected:
+                logger.info("Index '%s' was built with %s, rebuilding", self.name, meta)
+                return None
+            if time.time() - meta.get("synced_at", 0) > self.max_lag_seconds:
+                # As alterações que faltam podem já ter sido apagadas de index_changes
+                logger.info("Index '%s' snapshot is older than the change log, rebuilding", self.name)
+                return None
+            index = faiss.read_index(str(self.path))
+
+        self._cursor = meta.get("cursor", 0)
+        self._synced_at = meta["synced_at"]
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self._fallback = bool(meta.get("fallback"))
+        self._tombstones = set(meta.get("tombstones", []))
+        self._generation = meta.get("generation", 0)
+        self._search_params = None
+        tune_index(index, settings.index_ef_search, settings.index_nprobe)
+        return index
+
+    def ensure_loaded(self) -> faiss.Index:
+        """The index, loaded or rebuilt on first use and brought up to date with the change log."""
+        with self._lock:
+            if self._index is not None and time.time() - self._synced_at > self.max_lag_seconds:
+                self._index = None  # parado há demasiado tempo: recarregar
+
+            if self._index is not None:
+                self.sync()
+                return self._index
+
+            index = self._read()
+            if index is None:
+                self.rebuild()
+                return self._index
+
+            self._index = index
+            self.sync()
+            if self._indexed_item_count(index) != self.count_items():
+                logger.info("Index '%s' doesn't match the table, rebuilding", self.name)
+                self.rebuild()
+            else:
+                self._maybe_compact()
+            return self._index
+
+    def sync(self) -> int:
+        """
+        Apply the changes queued in `index_changes` since the last sync: re-embed
+        the items that still exist, drop the ones that were deleted. Returns the
+        number of items touched.
+        """
+        with self._lock:
+            touched = self._catch_up()
+            if touched:
+                self._dirty = True
+                if time.monotonic() - self._saved_at >= settings.index_save_interval_seconds:
+                    self._save()
+                self._maybe_compact()
+            return touched
+
+    def flush(self) -> None:
+        """Write the snapshot now if it is missing incremental changes."""
+        with self._lock:
+            if self._dirty and self._index is not None:
+                try:
+                    self._save()
+                except Exception:
+                    logger.exception("Could not save index '%s'", self.name)
+
+    def _catch_up(self) -> int:
+        synced_at = time.time()
+        touched = 0
+        while True:
+            changes = self.changes.since(self.kind, self._cursor, limit=SYNC_PAGE_SIZE)
+            if not changes:
+                break
+            ids = list(dict.fromkeys(item_id for _, item_id in changes))
+            self._apply(ids)
+            # Só avança depois de aplicar: uma falha repete o lote na próxima vez
+            self._cursor = changes[-1][0]
+            touched += len(ids)
+        self._synced_at = synced_at
+        if touched:
+            logger.debug("Index '%s' applied %d queued changes", self.name, touched)
+        return touched
+
+    def _apply(self, ids: Sequence[int]) -> None:
+        items = self.fetch_many(ids)
+        self._remove(ids)
+        batch_size = settings.embedding_batch_size
+        for start in range(0, len(items), batch_size):
+            self._add(items[start:start + batch_size])
+
+        deleted = set(ids) - {item["id"] for item in items}
+        if deleted:
+            self.embedding_repo.delete(self.cache_kind, list(deleted))
+
+    def _build(self, items: Sequence[Dict[str, Any]]) -> tuple[faiss.Index, bool]:
+        vectors = self.embed(items) if items else []
+        index, fallback = self._new_index(np.vstack(vectors) if vectors else None)
+        self._add_vectors(index, items, vectors, generation=0)
+        return index, fallback
+
+    def rebuild(self) -> None:
+        # Cursor lido antes das linhas: alterações concorrentes são reaplicadas no próximo sync
+        cursor = self.changes.last_id(self.kind)
+        items = self.fetch_all()
+        self.embedding_repo.delete_other_models(self.cache_kind, self.embedding_service.model_key)
+        with self._lock:
+            self._install(*self._build(items))
+            self._cursor = cursor
+            self._synced_at = time.time()
+            self._compaction = None  # uma compactação em curso fica obsoleta
+            self._save()
+        logger.info("Rebuilt index '%s' with %d items", self.name, len(items))
+
+    def _maybe_compact(self) -> None:
+        """
+        Start a background rebuild when the index has accumulated enough
+        tombstones, or is a Flat fallback that can now be trained. Searches and
+        updates keep using the current index until the new one is swapped in.
+        """
+        dead = len(self._tombstones)
+        due = (
+            (dead and dead >= settings.index_compact_ratio * max(self._live_count(self._index), 1))
+            or (self._fallback and self._indexed_item_count(self._index) >= self.min_train_size)
+        )
+        if not due or self._compaction is not None:
+            return
+        token = self._compaction = object()
+        threading.Thread(
+            target=self._compact, args=(token,), name=f"compact-{self.name}", daemon=True
+        ).start()
+
+    def _compact(self, token: object) -> None:
+        try:
+            cursor = self.changes.last_id(self.kind)
+            items = self.fetch_all()
+            index, fallback = self._build(items)
+        except Exception:
+            logger.exception("Background rebuild of index '%s' failed", self.name)
+            with self._lock:
+                if self._compaction is token:
+                    self._compaction = None
+            return
+
+        with self._lock:
+            if self._compaction is not token:
+                return  # reconstruído entretanto
+            self._compaction = None
+            self._install(index, fallback)
+            self._cursor = cursor
+            try:
+                # Repete as alterações feitas durante a reconstrução (os vetores já estão na cache)
+                self._catch_up()
+            except Exception:
+                logger.exception("Could not apply queued changes to index '%s'", self.name)
+            self._save()
+        logger.info("Rebuilt index '%s' in the background with %d items", self.name, len(items))
+
+    def invalidate(self) -> None:
+        """Drop the index so the next search rebuilds it."""
+        with self._lock:
+            self._index = None
+            self.path.unlink(missing_ok=True)
+
+    # --- Updates ---
+
+    def embed(self, items: Sequence[Dict[str, Any]]) -> List[np.ndarray]:
+        """
+        Normalized `(n_chunks, dim)` vectors for each item (one row unless chunked),
+        encoding only the items missing from the cache, in a single batch.
+        """
+        model_name = self.embedding_service.model_key
+        chunks = [self.item_chunks(item)[:CHUNK_STRIDE] for item in items]
+        hashes = [hashlib.sha256("\x1f".join(c).encode("utf-8")).hexdigest() for c in chunks]
+
+        cached = self.embedding_repo.get_many(self.cache_kind, [item["id"] for item in items], model_name)
+
+        vectors: List[np.ndarray | None] = [None] * len(items)
+        missing = []
+        for i, (item, content_hash) in enumerate(zip(items, hashes)):
+            row = cached.get(item["id"])
+            if row is not None and row.content_hash == content_hash:
+                vectors[i] = EmbeddingRepo.to_array(row).astype(np.float32)
+            else:
+                missing.append(i)
+
+        if missing:
+            texts = [text for i in missing for text in chunks[i]]
+            encoded = normalize(self.embedding_service.encode_batch(texts))
+
+            entries = []
+            offset = 0
+            for i in missing:
+                n = len(chunks[i])
+                stored = encoded[offset:offset + n].astype(self.vector_dtype)
+                vectors[i] = stored.astype(np.float32)
+                entries.append((items[i]["id"], hashes[i], stored))
+                offset += n
+            self.embedding_repo.save_many(self.cache_kind, model_name, entries)
+
+        logger.debug("Embedded %d %s (%d from cache)", len(items), self.name, len(items) - len(missing))
+        return vectors
+
+    def _add(self, items: Sequence[Dict[str, Any]]) -> None:
+        if not items:
+            return
+        self._add_vectors(self._index, items, self.embed(items), self._generation)
+
+    def _add_vectors(
+        self, index: faiss.Index, items: Sequence[Dict[str, Any]], vectors: List[np.ndarray], generation: int
+    ) -> None:
+        if not items:
+            return
+        labels = np.concatenate([self._labels(item["id"], len(v), generation) for item, v in zip(items, vectors)])
+        index.add_with_ids(np.ascontiguousarray(np.vstack(vectors)), labels)
+
+    def _remove(self, ids: Sequence[int]) -> None:
+        """
+        Remove the vectors of `ids` from the index. Index types that can't
+        remove vectors (HNSW) tombstone them instead, and later additions use
+        a new label generation.
+        """
+        labels = self._live_labels(self._index)
+        labels = labels[np.isin(self._item_ids(labels), np.asarray(ids, dtype=np.int64))]
+        if not len(labels):
+            return
+
+        try:
+            self._index.remove_ids(labels)
+        except RuntimeError:
+            self._tombstones.update(labels.tolist())
+            self._generation += 1
+            self._search_params = None
+
+    # --- Search ---
+
+    def search(self, query_vec: np.ndarray, top_n: int = 5) -> List[tuple[int, float]]:
+        """Return `(id, score)` pairs for the `top_n` nearest items."""
+        return self.search_many(query_vec, top_n)[0]
+
+    def _params(self) -> faiss.SearchParameters | None:
+        """Search parameters that skip tombstoned labels (None when there are none)."""
+        if not self._tombstones:
+            return None
+        if self._search_params is None:
+            import faiss
+
+            excluded = faiss.IDSelectorBatch(np.fromiter(self._tombstones, dtype=np.int64))
+            selector = faiss.IDSelectorNot(excluded)
+            # Os seletores só guardam ponteiros: manter as três referências vivas
+            self._search_params = (faiss.SearchParameters(sel=selector), selector, excluded)
+        return self._search_params[0]
+
+    def search_many(self, query_vecs: np.ndarray, top_n: int = 5) -> List[List[tuple[int, float]]]:
+        """
+        `search` for several queries at once: one row of `(id, score)` pairs per
+        query vector, answered with a single matrix search.
+        """
+        query_vecs = normalize(query_vecs)
+        if self.chunked:
+            return [self._search_chunks(query_vec[None, :], top_n) for query_vec in query_vecs]
+
+        with self._lock:
+            index = self.ensure_loaded()
+            live = self._live_count(index)
+            if live == 0:
+                return [[] for _ in query_vecs]
+            scores, labels = index.search(query_vecs, min(top_n, live), params=self._params())
+
+        return [
+            [
+                (int(self._item_ids(label)), float(score))
+                for label, score in zip(row_labels, row_scores)
+                if label != -1
+            ]
+            for row_labels, row_scores in zip(labels, scores)
+        ]
+
+    def _search_chunks(self, query_vec: np.ndarray, top_n: int) -> List[tuple[int, float]]:
+        """
+        Find candidate items through their nearest chunks, then score each
+        candidate exactly over all of its chunks (max or top-k mean).
+        """
+        with self._lock:
+            index = self.ensure_loaded()
+            live = self._live_count(index)
+            if live == 0:
+                return []
+
+            # Vários chunks do mesmo item podem ocupar o topo: alarga até haver candidatos
+            k = min(live, top_n * 8)
+            while True:
+                _, labels = index.search(query_vec, k, params=self._params())
+                candidates = list(dict.fromkeys(int(i) for i in self._item_ids(labels[0][labels[0] != -1])))
+                if len(candidates) >= top_n * 2 or k >= live:
+                    break
+                k = min(live, k * 4)
+
+        rows = self.embedding_repo.get_many(self.cache_kind, candidates, self.embedding_service.model_key)
+        scored = []
+        for item_id in candidates:
+            row = rows.get(item_id)
+            if row is None:
+                continue
+            sims = EmbeddingRepo.to_array(row).astype(np.float32) @ query_vec[0]
+            scored.append((item_id, pool_scores(sims)))
+
+        scored.sort(key=lambda pair: pair[1], reverse=True)
+        return scored[:top_n]
+
+
+def pool_scores(similarities: np.ndarray) -> float:
+    """Item score from its chunk similarities, per `settings.chunk_pooling`."""
+    if settings.chunk_pooling == "topk_mean":
+        k = min(settings.chunk_top_k, len(similarities))
+        return float(np.mean(np.sort(similarities)[-k:]))
+    return float(np.max(similarities))
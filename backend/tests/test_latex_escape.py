@@ -0,0 +1,73 @@
+"""
+`escape_latex` must produce exactly what the original chain of ten
+`str.replace` calls produced (see benchmarks/bench_escape_latex.py for timings).
+"""
+import random
+import string
+
+import pytest
+
+from services.latex_service import escape_latex
+
+
+def escape_latex_reference(text: str) -> str:
+    """Original implementation: ten sequential str.replace passes."""
+    if text is None:
+        return ""
+
+    replacements = {
+        "\\": r"\textbackslash{}",
+        "&": r"\&",
+        "%": r"\%",
+        "$": r"\$",
+        "#": r"\#",
+        "_": r"\_",
+        "{": r"\{",
+        "}": r"\}",
+        "~": r"\textasciitilde{}",
+        "^": r"\^{}",
+    }
+
+    s = str(text)
+    for k, v in replacements.items():
+        s = s.replace(k, v)
+
+    return s
+
+
+CORPUS = [
+    "John Doe", "john.doe@example.com", "+1 (555) 123-4567", "New York, NY, USA",
+    "https://linkedin.com/in/johndoe", "https://github.com/johndoe",
+    "A passionate software engineer with 8 years of experience building web platforms.",
+    "Python", "FastAPI", "C#", "C++", "Node.js", "PostgreSQL", "Docker", "R&D", "CI/CD",
+    "CVForge",
+    "AI-powered CV generator that matches projects to job descriptions using sentence embeddings.",
+    "Python, FastAPI, SQLAlchemy, FAISS",
+    "Reduced p99 latency by 40% & cut infra costs by $2k/month",
+    "payments_service",
+    "Migrated a legacy monolith to event-driven services handling 10k req/s at 99.9% uptime.",
+] * 4
+
+EDGE_CASES = [
+    None, "", "\\", "\\\\", "{}", "\\{}", "~^", "100%", "a_b_c", "#1 & $2", "ção — naïve ✓",
+    "\\textbf{x}", "}{", "~~~", 42, 3.14,
+]
+
+
+def random_cases(samples: int = 20_000, seed: int = 0) -> list[str]:
+    alphabet = string.ascii_letters + string.digits + " \\&%$#_{}~^" + "çãé€"
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        for _ in range(samples)
+    ]
+
+
+@pytest.mark.parametrize("text", EDGE_CASES + sorted(set(CORPUS)))
+def test_matches_reference(text):
+    assert escape_latex(text) == escape_latex_reference(text)
+
+
+def test_matches_reference_on_random_strings():
+    for text in random_cases():
+        assert escape_latex(text) == escape_latex_reference(text), repr(text)
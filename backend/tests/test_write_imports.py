@@ -0,0 +1,54 @@
+"""
+CRUD and bulk writes only queue index changes: they must not pull the ML stack
+(torch, sentence_transformers, faiss) into the API process.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("torch", "sentence_transformers", "faiss", "transformers")
+
+WRITE_SCRIPT = f"""
+import sys
+from fastapi.testclient import TestClient
+import main
+
+client = TestClient(main.app)
+project = {{"title": "P", "description": "d", "technologies": [], "achievements": [], "duration": "1y"}}
+experience = {{"position": "Dev", "company": "ACME", "start_date": "2020-01-01", "technologies": [], "achievements": []}}
+
+created = client.post("/api/projects", json=project)
+assert created.status_code == 201, created.text
+project_id = created.json()["id"]
+assert client.put(f"/api/projects/{{project_id}}", json={{"description": "e"}}).status_code == 200
+assert client.delete(f"/api/projects/{{project_id}}").status_code == 204
+assert client.post("/api/projects/bulk", json=[project, project]).json()["inserted"] == 2
+
+created = client.post("/api/experiences", json=experience)
+assert created.status_code == 201, created.text
+assert client.delete(f"/api/experiences/{{created.json()['id']}}").status_code == 204
+assert client.post("/api/experiences/bulk", json=[experience]).json()["inserted"] == 1
+
+print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+
+def test_writes_do_not_import_ml_stack(tmp_path):
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'cvforge.db'}",
+        "DATA_DIR": str(tmp_path),
+        "GENERATED_DIR": str(tmp_path / "generated"),
+        "EMBEDDING_WARMUP": "false",
+    }
+    completed = subprocess.run(
+        [sys.executable, "-c", WRITE_SCRIPT],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    assert completed.returncode == 0, completed.stderr
+
+    loaded = [m for m in completed.stdout.strip().split(",") if m]
+    assert not loaded, f"ML stack imported by a write: {', '.join(loaded)}"
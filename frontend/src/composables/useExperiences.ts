@@ -2,8 +2,10 @@ import { ref } from 'vue'
 import useAPI from './useAPI'
 
 interface Response {
+  total: number | null,
   offset: number,
   limit: number,
+  next_cursor: string | null,
   experiences: Experience[]
 }
 
@@ -20,12 +22,29 @@ export function useExperiences() {
   const api = useAPI()
   const experiences = ref<Experience[]>([])
   const loading = ref(false)
+  const nextCursor = ref<string | null>(null)
 
   async function getExperiences() {
     loading.value = true
     try {
       const res = await api.get<Response>('/experiences')
       experiences.value = res.data.experiences
+      nextCursor.value = res.data.next_cursor
+    } finally {
+      loading.value = false
+    }
+  }
+
+  // Infinite scroll: keyset pagination, no count query
+  async function loadMoreExperiences(limit = 20) {
+    if (!nextCursor.value || loading.value) return
+    loading.value = true
+    try {
+      const res = await api.get<Response>('/experiences', {
+        params: { after: nextCursor.value, limit, include_total: false },
+      })
+      experiences.value.push(...res.data.experiences)
+      nextCursor.value = res.data.next_cursor
     } finally {
       loading.value = false
     }
@@ -50,7 +69,9 @@ export function useExperiences() {
   return {
     experiences,
     loading,
+    nextCursor,
     getExperiences,
+    loadMoreExperiences,
     addExperience,
     updateExperience,
     deleteExperience,
@@ -2,8 +2,10 @@ import { ref } from 'vue'
 import useAPI from './useAPI'
 
 interface Response {
+  total: number | null,
   offset: number,
   limit: number,
+  next_cursor: string | null,
   projects: Project[]
 }
 
@@ -22,6 +24,7 @@ export function useProjects() {
   const projects = ref<Project[]>([])
   const loading = ref(false)
   const error = ref<string | null>(null)
+  const nextCursor = ref<string | null>(null)
 
   async function getProjects() {
     loading.value = true
@@ -29,6 +32,25 @@ export function useProjects() {
     try {
       const res = await api.get<Response>('/projects')
       projects.value = res.data.projects
+      nextCursor.value = res.data.next_cursor
+    } catch (err: any) {
+      error.value = err.message
+    } finally {
+      loading.value = false
+    }
+  }
+
+  // Infinite scroll: keyset pagination, no count query
+  async function loadMoreProjects(limit = 20) {
+    if (!nextCursor.value || loading.value) return
+    loading.value = true
+    error.value = null
+    try {
+      const res = await api.get<Response>('/projects', {
+        params: { after: nextCursor.value, limit, include_total: false },
+      })
+      projects.value.push(...res.data.projects)
+      nextCursor.value = res.data.next_cursor
     } catch (err: any) {
       error.value = err.message
     } finally {
@@ -68,7 +90,9 @@ export function useProjects() {
     projects,
     loading,
     error,
+    nextCursor,
     getProjects,
+    loadMoreProjects,
     addProject,
     updateProject,
     deleteProject,